@@ -1,63 +1,105 @@
 """Configuration module for MCP Data Analyst."""
 
 import os
+from dataclasses import dataclass
+from functools import cache
 from typing import Optional
 
 from dotenv import load_dotenv
 
 from DataAnalyst.database.DbTypes import DbTypes
 
+# DB_TYPE string -> enum member, built once (members compare and hash as str)
+_DB_TYPE_INDEX: dict[str, DbTypes] = {member: member for member in DbTypes}
+_VALID_DB_TYPE_VALUES: frozenset[str] = frozenset(DbTypes)
+
+
+@cache
+def _load_env_once() -> None:
+    """Load environment variables from .env; repeated calls are no-ops."""
+    load_dotenv(override=False)
+
+
 # Load environment variables
-load_dotenv()
+_load_env_once()
 
 
-class Config:
-    """Application configuration."""
+@dataclass(frozen=True, slots=True)
+class _Config:
+    """Application configuration, resolved once from the environment."""
 
     # LLM Configuration
-    LLM_API_KEY: str = os.getenv("LLM_API_KEY", "")
-    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
-    LLM_API_URL: str = os.getenv("LLM_API_URL", "https://api.openai.com/v1")
+    LLM_API_KEY: str
+    LLM_MODEL: str
+    LLM_API_URL: str
 
     # Database Configuration
-    DB_TYPE: str = os.getenv("DB_TYPE", "mysql")
-    DB_HOST: str = os.getenv("DB_HOST", "localhost")
-    DB_PORT: int = int(os.getenv("DB_PORT", "3306"))
-    DB_USER: str = os.getenv("DB_USER", "root")
-    DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
-    DB_NAME: str = os.getenv("DB_NAME", "")
+    DB_TYPE: str
+    DB_HOST: str
+    DB_PORT: int
+    DB_USER: str
+    DB_PASSWORD: str
+    DB_NAME: str
+
+    # Connection pool sizing (PostgreSQL, MySQL, SSAS)
+    DB_POOL_MIN_SIZE: int
+    DB_POOL_MAX_SIZE: int
 
     # Schema cache directory
-    SCHEMA_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "database")
+    SCHEMA_DIR: str
 
-    @classmethod
-    def validate(cls) -> None:
+    def validate(self) -> None:
         """Validate required configuration values."""
         errors = []
 
-        if not cls.LLM_API_KEY:
+        if not self.LLM_API_KEY:
             errors.append("LLM_API_KEY is required")
 
-        if not cls.DB_NAME:
+        if not self.DB_NAME:
             errors.append("DB_NAME is required")
 
-        valid_types = [
-            DbTypes.MYSQL.value,
-            DbTypes.POSTGRESQL.value,
-            DbTypes.MSSQL.value,
-            DbTypes.MONGODB.value,
-            DbTypes.SQLITE.value,
-            DbTypes.SSAS.value,
-            DbTypes.ELASTICSEARCH.value,
-            DbTypes.INFLUXDB.value
-        ]
-        if cls.DB_TYPE not in valid_types:
-            errors.append(f"DB_TYPE must be one of: {', '.join(valid_types)}")
+        if self.DB_TYPE not in _VALID_DB_TYPE_VALUES:
+            errors.append(f"DB_TYPE must be one of: {', '.join(_DB_TYPE_INDEX)}")
 
         if errors:
             raise ValueError("Configuration errors:\n" + "\n".join(f"  - {e}" for e in errors))
 
-    @classmethod
-    def get_db_type(cls) -> DbTypes:
+    def get_db_type(self) -> DbTypes:
         """Get the database type as an enum."""
-        return cls.DB_TYPE
+        try:
+            return _DB_TYPE_INDEX[self.DB_TYPE]
+        except KeyError:
+            raise ValueError(f"Unsupported database type: {self.DB_TYPE}") from None
+
+
+@cache
+def get_config() -> _Config:
+    """Build the application configuration from the environment (once)."""
+    _load_env_once()
+    return _Config(
+        LLM_API_KEY=os.getenv("LLM_API_KEY", ""),
+        LLM_MODEL=os.getenv("LLM_MODEL", "gpt-3.5-turbo"),
+        LLM_API_URL=os.getenv("LLM_API_URL", "https://api.openai.com/v1"),
+        DB_TYPE=os.getenv("DB_TYPE", "mysql"),
+        DB_HOST=os.getenv("DB_HOST", "localhost"),
+        DB_PORT=int(os.getenv("DB_PORT", "3306")),
+        DB_USER=os.getenv("DB_USER", "root"),
+        DB_PASSWORD=os.getenv("DB_PASSWORD", ""),
+        DB_NAME=os.getenv("DB_NAME", ""),
+        DB_POOL_MIN_SIZE=int(os.getenv("DB_POOL_MIN_SIZE", "5")),
+        DB_POOL_MAX_SIZE=int(os.getenv("DB_POOL_MAX_SIZE", "25")),
+        SCHEMA_DIR=os.path.join(os.path.dirname(os.path.dirname(__file__)), "database"),
+    )
+
+
+def validate() -> None:
+    """Validate required configuration values."""
+    get_config().validate()
+
+
+def get_db_type() -> DbTypes:
+    """Get the database type as an enum."""
+    return get_config().get_db_type()
+
+
+Config = get_config()
@@ -1,12 +1,19 @@
 """Base class for database connections."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, Iterator, Optional
+
+import orjson
+
+# Upper bound on concurrent per-table lookups in build_definition
+SCHEMA_BUILD_WORKERS = 8
 
 
 class BaseDatabase(ABC):
     """Abstract base class for database implementations."""
 
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self):
         """Initialize the database connection."""
@@ -17,12 +24,56 @@ class BaseDatabase(ABC):
         """Execute a SQL query and return the results."""
         pass
 
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute a query and yield its result rows one by one.
+
+        Statements that return no rows yield nothing. This default decodes
+        the buffered result of execute_query(); backends with a cursor
+        override it to stream rows as they are fetched.
+        """
+        rows = orjson.loads(self.execute_query(query))
+        if isinstance(rows, list):
+            yield from rows
+
     @abstractmethod
     def build_definition(self, path: str) -> None:
         """Build the database schema definition and save it to the specified path."""
         pass
 
+    def schema_version(self) -> Optional[str]:
+        """Return a cheap token that changes whenever the schema changes.
+
+        A rebuild is skipped while the token matches the one recorded by the
+        last build. The default, None, means the backend cannot tell, so every
+        rebuild runs the full introspection.
+        """
+        return None
+
+    def healthy(self) -> bool:
+        """Return whether the connection can still serve queries.
+
+        This runs on every tool call, so implementations must not touch the
+        network. Broken connections are the pool's or client's business:
+        pools check a connection that sat idle before handing it out.
+        """
+        return True
+
+    def ping(self) -> None:
+        """Run the cheapest query the backend offers, raising if it fails.
+
+        Unlike healthy(), this does a round trip; it keeps an idle
+        connection in use. The default runs ``SELECT 1``.
+        """
+        for _ in self.iter_query("SELECT 1"):
+            pass
+
     @abstractmethod
     def close(self) -> None:
         """Close the database connection."""
-        pass
\ No newline at end of file
+        pass
+
+    def __enter__(self) -> "BaseDatabase":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
\ No newline at end of file
@@ -1,6 +1,6 @@
-from enum import Enum
+from enum import StrEnum
 
-class DbTypes(Enum):
+class DbTypes(StrEnum):
     MYSQL = "mysql"
     POSTGRESQL = "postgresql"
     MSSQL = "mssql"
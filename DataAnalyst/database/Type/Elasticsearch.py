@@ -1,51 +1,75 @@
 """Elasticsearch database implementation using the SQL API."""
 
-import json
-from typing import Any, Dict
+import atexit
+from functools import cache
+from typing import TYPE_CHECKING, Any, Dict, Iterator
 
 from DataAnalyst.config import Config
 from DataAnalyst.database.BaseDatabase import BaseDatabase
-from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition
+from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition, write_definitions
+from DataAnalyst.database.serialization import to_json
+
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch as ESClient
+
+
+@cache
+def _es_client(scheme: str) -> "ESClient":
+    """Return the process-wide Elasticsearch client.
+
+    The client keeps a pool of HTTP connections, so it is created once and
+    shared by every Elasticsearch instance.
+    """
+    try:
+        from elasticsearch import Elasticsearch as ESClient
+    except ImportError as exc:
+        raise ImportError(
+            "elasticsearch is required for Elasticsearch connections. "
+            "Install it with: pip install elasticsearch"
+        ) from exc
+
+    hosts = [{"host": Config.DB_HOST, "port": Config.DB_PORT, "scheme": scheme}]
+
+    if Config.DB_USER and Config.DB_PASSWORD:
+        client = ESClient(hosts, basic_auth=(Config.DB_USER, Config.DB_PASSWORD))
+    else:
+        client = ESClient(hosts)
+
+    atexit.register(client.close)
+    return client
 
 
 class Elasticsearch(BaseDatabase):
     """Elasticsearch implementation using SQL over the SQL API."""
 
+    __slots__ = ('client',)
+
     def __init__(self):
         """Initialize Elasticsearch connection."""
-        try:
-            from elasticsearch import Elasticsearch as ESClient
-        except ImportError as exc:
-            raise ImportError(
-                "elasticsearch is required for Elasticsearch connections. "
-                "Install it with: pip install elasticsearch"
-            ) from exc
-
         scheme = getattr(Config, "DB_SCHEME", "http")
-        hosts = [{"host": Config.DB_HOST, "port": Config.DB_PORT, "scheme": scheme}]
-
-        if Config.DB_USER and Config.DB_PASSWORD:
-            self.client = ESClient(hosts, basic_auth=(Config.DB_USER, Config.DB_PASSWORD))
-        else:
-            self.client = ESClient(hosts)
+        self.client = _es_client(scheme)
 
     def execute_query(self, query: str) -> Any:
         """Execute an Elasticsearch SQL query and return results as JSON."""
+        return to_json(list(self.iter_query(query)))
+
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute an Elasticsearch SQL query and yield its rows as dicts."""
         try:
             response = self.client.sql.query(body={"query": query})
-            columns = [col["name"] for col in response.get("columns", [])]
-            rows = response.get("rows", [])
-
-            results = [dict(zip(columns, row)) for row in rows]
-            return json.dumps(results, default=str)
         except Exception as exc:
             raise RuntimeError(f"Failed to execute Elasticsearch SQL query: {str(exc)}") from exc
 
+        columns = [col["name"] for col in response.get("columns", [])]
+        for row in response.get("rows", []):
+            yield dict(zip(columns, row))
+
     def build_definition(self, storage_location: str) -> None:
         """Build index schema definitions from mappings."""
         try:
             mappings = self.client.indices.get_mapping(index="*")
 
+            definitions = []
             for index_name, index_body in mappings.items():
                 properties: Dict[str, Dict[str, Any]] = (
                     index_body.get("mappings", {}).get("properties", {})
@@ -65,11 +89,27 @@ class Elasticsearch(BaseDatabase):
                     )
 
                 table_info = TableDefinition(name=index_name, columns=columns)
-                table_info.write_to_file(storage_location)
+                definitions.append(table_info)
+
+            write_definitions(definitions, storage_location)
         except Exception as exc:
             raise RuntimeError(f"Failed to build Elasticsearch schema definition: {str(exc)}") from exc
 
+    def healthy(self) -> bool:
+        """Report whether this instance still holds the shared client.
+
+        The client's transport retries a request that hits a dead connection.
+        """
+        return self.client is not None
+
+    def ping(self) -> None:
+        """Ping the cluster; the client reports failure as False rather than raising."""
+        if not self.client.ping():
+            raise ConnectionError(f"Elasticsearch at {Config.DB_HOST} did not answer the ping")
+
     def close(self) -> None:
-        """Close the Elasticsearch connection."""
-        if self.client:
-            self.client.close()
+        """Release this instance's handle on the shared client.
+
+        The client itself stays open for other instances and is closed at exit.
+        """
+        self.client = None
@@ -1,16 +1,19 @@
 """InfluxDB database implementation using InfluxQL (v1)."""
 
-import json
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator
 
 from DataAnalyst.config import Config
-from DataAnalyst.database.BaseDatabase import BaseDatabase
-from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition
+from DataAnalyst.database.BaseDatabase import SCHEMA_BUILD_WORKERS, BaseDatabase
+from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition, write_definitions
+from DataAnalyst.database.serialization import to_json
 
 
 class InfluxDB(BaseDatabase):
     """InfluxDB implementation using InfluxQL."""
 
+    __slots__ = ('client',)
+
     def __init__(self):
         """Initialize InfluxDB connection."""
         try:
@@ -31,48 +34,69 @@ class InfluxDB(BaseDatabase):
 
     def execute_query(self, query: str) -> Any:
         """Execute an InfluxQL query and return results as JSON."""
+        return to_json(list(self.iter_query(query)))
+
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute an InfluxQL query and yield its points, tagged with their measurement."""
         try:
             result = self.client.query(query)
-            points = []
-            for measurement, rows in result.items():
-                for row in rows:
-                    row_with_measurement = dict(row)
-                    row_with_measurement["_measurement"] = measurement[0]
-                    points.append(row_with_measurement)
-
-            return json.dumps(points, default=str)
         except Exception as exc:
             raise RuntimeError(f"Failed to execute InfluxQL query: {str(exc)}") from exc
 
+        for measurement, rows in result.items():
+            for row in rows:
+                row_with_measurement = dict(row)
+                row_with_measurement["_measurement"] = measurement[0]
+                yield row_with_measurement
+
     def build_definition(self, storage_location: str) -> None:
         """Build schema definition based on measurements and field keys."""
         try:
             measurements_result = self.client.query("SHOW MEASUREMENTS")
             measurements = [m["name"] for m in measurements_result.get_points()]
 
-            for measurement in measurements:
-                field_keys_result = self.client.query(f"SHOW FIELD KEYS FROM {measurement}")
-                columns = {}
-                for field in field_keys_result.get_points():
-                    field_name = field.get("fieldKey")
-                    field_type = field.get("fieldType", "string")
-                    if field_name:
-                        columns[field_name] = ColumnDefinition(
-                            name=field_name,
-                            data_type=field_type,
-                            is_nullable=True,
-                            is_primary_key=False,
-                            is_foreign_key=False,
-                            foreign_key_reference="",
-                            comments=""
-                        )
-
-                table_info = TableDefinition(name=measurement, columns=columns)
-                table_info.write_to_file(storage_location)
+            # SHOW FIELD KEYS is issued concurrently for all measurements
+            with ThreadPoolExecutor(max_workers=SCHEMA_BUILD_WORKERS) as executor:
+                tables = list(executor.map(self._build_measurement_definition, measurements))
+
+            write_definitions(tables, storage_location)
         except Exception as exc:
             raise RuntimeError(f"Failed to build InfluxDB schema definition: {str(exc)}") from exc
 
+    def _build_measurement_definition(self, measurement: str) -> TableDefinition:
+        """Build the definition of a single measurement from its field keys."""
+        field_keys_result = self.client.query(f"SHOW FIELD KEYS FROM {measurement}")
+        columns = {}
+        for field in field_keys_result.get_points():
+            field_name = field.get("fieldKey")
+            field_type = field.get("fieldType", "string")
+            if field_name:
+                columns[field_name] = ColumnDefinition(
+                    name=field_name,
+                    data_type=field_type,
+                    is_nullable=True,
+                    is_primary_key=False,
+                    is_foreign_key=False,
+                    foreign_key_reference="",
+                    comments=""
+                )
+
+        return TableDefinition(name=measurement, columns=columns)
+
+    def healthy(self) -> bool:
+        """Report whether the client is still open.
+
+        Queries are plain HTTP requests, which the client retries on
+        connection errors.
+        """
+        return self.client is not None
+
+    def ping(self) -> None:
+        """Ping the server."""
+        self.client.ping()
+
     def close(self) -> None:
         """Close the InfluxDB connection."""
         if self.client:
             self.client.close()
+            self.client = None
@@ -1,86 +1,139 @@
 """Microsoft SQL Server database implementation."""
 
-import json
-from typing import Any
-
-import pyodbc
+import atexit
+import sys
+from collections import defaultdict
+from functools import cache, partial
+from typing import Any, Dict, Iterator, Optional
 
 from DataAnalyst.config import Config
 from DataAnalyst.database.BaseDatabase import BaseDatabase
-from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition
+from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition, write_definitions
+from DataAnalyst.database.pool import QueuePool, check_select_one
+from DataAnalyst.database.serialization import cursor_to_json, iter_cursor, to_json
+
+
+@cache
+def _connection_pool() -> QueuePool:
+    """Return the process-wide MSSQL connection pool.
+
+    Every query checks a connection out for its own duration; a connection
+    that sat idle runs SELECT 1 before it is reused, so connections dropped
+    by a server restart are replaced instead of failing a query.
+    """
+    try:
+        import pyodbc
+    except ImportError as exc:
+        raise ImportError(
+            "pyodbc is required for MSSQL connections. "
+            "Install it with: pip install pyodbc"
+        ) from exc
+
+    connection_string = (
+        f"DRIVER={{ODBC Driver 18 for SQL Server}};"
+        f"SERVER={Config.DB_HOST},{Config.DB_PORT};"
+        f"DATABASE={Config.DB_NAME};"
+        f"UID={Config.DB_USER};"
+        f"PWD={Config.DB_PASSWORD};"
+        f"TrustServerCertificate=yes;"
+    )
+    # The pool below replaces ODBC driver-manager pooling, which would hand
+    # out connections without checking them
+    pyodbc.pooling = False
+
+    pool = QueuePool(
+        partial(pyodbc.connect, connection_string),
+        max_size=Config.DB_POOL_MAX_SIZE,
+        min_size=Config.DB_POOL_MIN_SIZE,
+        check=check_select_one
+    )
+    atexit.register(pool.close)
+    return pool
 
 
 class MSSQL(BaseDatabase):
     """Microsoft SQL Server database implementation."""
 
+    __slots__ = ('pool',)
+
     def __init__(self):
-        """Initialize MSSQL connection."""
-        connection_string = (
-            f"DRIVER={{ODBC Driver 18 for SQL Server}};"
-            f"SERVER={Config.DB_HOST},{Config.DB_PORT};"
-            f"DATABASE={Config.DB_NAME};"
-            f"UID={Config.DB_USER};"
-            f"PWD={Config.DB_PASSWORD};"
-            f"TrustServerCertificate=yes;"
-        )
-        self.connection = pyodbc.connect(connection_string)
+        """Initialize MSSQL access and check the server is reachable."""
+        self.pool = _connection_pool()
+        with self.pool.connection():
+            pass
 
     def execute_query(self, query: str) -> Any:
         """Execute a SQL query and return results as JSON."""
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(query)
-            
-            # Check if this is a SELECT query
-            if cursor.description is None:
-                self.connection.commit()
-                return json.dumps({"affected_rows": cursor.rowcount})
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
             
-            row_headers = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
-            json_data = []
+                # Check if this is a SELECT query
+                if cursor.description is None:
+                    connection.commit()
+                    return to_json({"affected_rows": cursor.rowcount})
             
-            for result in rows:
-                json_data.append(dict(zip(row_headers, result)))
+                row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+                return cursor_to_json(cursor, row_headers)
+            finally:
+                cursor.close()
+
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute a query and yield its result rows as they are fetched."""
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
 
-            return json.dumps(json_data, default=str)
-        finally:
-            cursor.close()
+                if cursor.description is None:
+                    connection.commit()
+                    return
+
+                row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+                yield from iter_cursor(cursor, row_headers)
+            finally:
+                cursor.close()
 
     def build_definition(self, storage_location: str) -> None:
         """Build the database schema definition and save it to the specified path."""
-        cursor = self.connection.cursor()
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
         
-        try:
-            # Get all tables in the database
-            cursor.execute(
-                "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES "
-                "WHERE TABLE_TYPE = 'BASE TABLE' AND TABLE_CATALOG = ?"
-            , (Config.DB_NAME,))
-            tables = cursor.fetchall()
-
-            for (table_name,) in tables:
-                # Get column information
+            try:
+                # Get all tables in the database
                 cursor.execute(
-                    "SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT "
+                    "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES "
+                    "WHERE TABLE_TYPE = 'BASE TABLE' AND TABLE_CATALOG = ?"
+                , (Config.DB_NAME,))
+                tables = cursor.fetchall()
+
+                # Get column information for all tables at once
+                cursor.execute(
+                    "SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, IS_NULLABLE "
                     "FROM INFORMATION_SCHEMA.COLUMNS "
-                    "WHERE TABLE_NAME = ? "
-                    "ORDER BY ORDINAL_POSITION"
-                , (table_name,))
-                columns_info = cursor.fetchall()
+                    "WHERE TABLE_CATALOG = ? "
+                    "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+                , (Config.DB_NAME,))
+                columns_by_table = defaultdict(list)
+                for row in cursor.fetchall():
+                    columns_by_table[row[0]].append(row[1:])
 
-                # Get primary keys
+                # Get primary keys for all tables
                 cursor.execute(
-                    "SELECT COLUMN_NAME "
+                    "SELECT TABLE_NAME, COLUMN_NAME "
                     "FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE "
                     "WHERE OBJECTPROPERTY(OBJECT_ID(CONSTRAINT_SCHEMA + '.' + CONSTRAINT_NAME), 'IsPrimaryKey') = 1 "
-                    "AND TABLE_NAME = ?"
-                , (table_name,))
-                primary_keys = {row[0] for row in cursor.fetchall()}
+                    "AND TABLE_CATALOG = ?"
+                , (Config.DB_NAME,))
+                primary_keys_by_table = defaultdict(set)
+                for row in cursor.fetchall():
+                    primary_keys_by_table[row[0]].add(row[1])
 
-                # Get foreign keys
+                # Get foreign keys for all tables
                 cursor.execute(
                     "SELECT "
+                    "    KCU.TABLE_NAME, "
                     "    KCU.COLUMN_NAME, "
                     "    KCU2.TABLE_NAME AS REFERENCED_TABLE_NAME, "
                     "    KCU2.COLUMN_NAME AS REFERENCED_COLUMN_NAME "
@@ -89,36 +142,70 @@ class MSSQL(BaseDatabase):
                     "    ON KCU.CONSTRAINT_NAME = RC.CONSTRAINT_NAME "
                     "INNER JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE AS KCU2 "
                     "    ON KCU2.CONSTRAINT_NAME = RC.UNIQUE_CONSTRAINT_NAME "
-                    "WHERE KCU.TABLE_NAME = ?"
-                , (table_name,))
-                foreign_keys = {row[0]: f"{row[1]}.{row[2]}" for row in cursor.fetchall()}
-
-                columns = {}
-                for column in columns_info:
-                    name = column[0]
-                    data_type = column[1]
-                    is_nullable = column[2] == 'YES'
-                    is_primary_key = name in primary_keys
-                    is_foreign_key = name in foreign_keys
-                    foreign_key_reference = foreign_keys.get(name, "")
+                    "WHERE KCU.TABLE_CATALOG = ?"
+                , (Config.DB_NAME,))
+                foreign_keys_by_table = defaultdict(dict)
+                for row in cursor.fetchall():
+                    foreign_keys_by_table[row[0]][row[1]] = f"{row[2]}.{row[3]}"
+
+                definitions = []
+                for (table_name,) in tables:
+                    columns_info = columns_by_table[table_name]
+                    primary_keys = primary_keys_by_table[table_name]
+                    foreign_keys = foreign_keys_by_table[table_name]
+
+                    columns = {}
+                    for column in columns_info:
+                        name = column[0]
+                        data_type = column[1]
+                        is_nullable = column[2] == 'YES'
+                        is_primary_key = name in primary_keys
+                        is_foreign_key = name in foreign_keys
+                        foreign_key_reference = foreign_keys.get(name, "")
                     
-                    column_info = ColumnDefinition(
-                        name=name,
-                        data_type=data_type,
-                        is_nullable=is_nullable,
-                        is_primary_key=is_primary_key,
-                        is_foreign_key=is_foreign_key,
-                        foreign_key_reference=foreign_key_reference,
-                        comments=""
-                    )
-                    columns[name] = column_info
-
-                table_info = TableDefinition(name=table_name, columns=columns)
-                table_info.write_to_file(storage_location)
-        finally:
-            cursor.close()
+                        column_info = ColumnDefinition(
+                            name=name,
+                            data_type=data_type,
+                            is_nullable=is_nullable,
+                            is_primary_key=is_primary_key,
+                            is_foreign_key=is_foreign_key,
+                            foreign_key_reference=foreign_key_reference,
+                            comments=""
+                        )
+                        columns[name] = column_info
+
+                    table_info = TableDefinition(name=table_name, columns=columns)
+                    definitions.append(table_info)
+
+                write_definitions(definitions, storage_location)
+            finally:
+                cursor.close()
+
+    def schema_version(self) -> Optional[str]:
+        """Return counts and checksums of the catalog's columns and key columns."""
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(
+                    "SELECT "
+                    "(SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = ?), "
+                    "(SELECT CHECKSUM_AGG(CHECKSUM(TABLE_NAME, COLUMN_NAME, DATA_TYPE, IS_NULLABLE)) "
+                    "    FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = ?), "
+                    "(SELECT COUNT(*) FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE WHERE TABLE_CATALOG = ?), "
+                    "(SELECT CHECKSUM_AGG(CHECKSUM(TABLE_NAME, COLUMN_NAME, CONSTRAINT_NAME)) "
+                    "    FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE WHERE TABLE_CATALOG = ?)"
+                , (Config.DB_NAME,) * 4)
+                return ":".join(str(value) for value in cursor.fetchone())
+            finally:
+                cursor.close()
+
+    def healthy(self) -> bool:
+        """Report whether this instance still holds the shared pool."""
+        return self.pool is not None
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self.connection:
-            self.connection.close()
+        """Release this instance's handle on the shared connection pool.
+
+        The pool itself stays open for other instances and is closed at exit.
+        """
+        self.pool = None
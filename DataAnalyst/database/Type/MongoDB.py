@@ -1,32 +1,157 @@
 """MongoDB NoSQL database implementation."""
 
+import atexit
 import json
-from typing import Any
-
-from pymongo import MongoClient
-from pymongo.database import Database as MongoDatabase
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple
 
 from DataAnalyst.config import Config
-from DataAnalyst.database.BaseDatabase import BaseDatabase
-from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition
+from DataAnalyst.database.BaseDatabase import SCHEMA_BUILD_WORKERS, BaseDatabase
+from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition, write_definitions
+from DataAnalyst.database.serialization import to_json
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+    from pymongo.collection import Collection
+    from pymongo.database import Database as MongoDatabase
+
+
+# collection_name.operation(json_args)
+_MONGO_QUERY_RE = re.compile(r'^(?P<coll>[^.]+)\.(?P<op>[^(]+)\((?P<args>.*)\)\s*$', re.DOTALL)
+
+# Argument type expected by each operation, with a description for errors
+_MONGO_ARG_TYPES: Dict[str, Tuple[type, str]] = {
+    'find': (dict, "a filter document"),
+    'find_one': (dict, "a filter document"),
+    'count_documents': (dict, "a filter document"),
+    'aggregate': (list, "a list of pipeline stages"),
+    'distinct': (str, "a field name"),
+}
+
+
+# Samples up to 100 documents and reduces them server-side to the distinct
+# (field, BSON type) pairs, plus the number of documents sampled
+_SCHEMA_SAMPLE_PIPELINE = [
+    {"$sample": {"size": 100}},
+    {"$facet": {
+        "count": [{"$count": "n"}],
+        "fields": [
+            {"$project": {"kv": {"$objectToArray": "$$ROOT"}}},
+            {"$unwind": "$kv"},
+            {"$group": {"_id": {"k": "$kv.k", "t": {"$type": "$kv.v"}}}},
+        ],
+    }},
+]
+
+
+@lru_cache(maxsize=1024)
+def _parse_mongo_query(query: str) -> Tuple[str, str, Any]:
+    """Parse ``collection_name.operation(json_args)`` into its parts.
+
+    Results are cached per query string, so the returned args are shared
+    between calls and must not be mutated by the caller.
+    """
+    match = _MONGO_QUERY_RE.match(query)
+    if match is None:
+        raise ValueError("Query must be in format: collection_name.operation(args)")
+    
+    collection_name, operation, args_str = match.group('coll', 'op', 'args')
+    
+    # Parse arguments (safely evaluate JSON)
+    args = json.loads(args_str) if args_str.strip() else {}
+    
+    return collection_name, operation, _canonical_args(operation, args)
+
+
+def _canonical_args(operation: str, args: Any) -> Any:
+    """Validate args against the shape the operation expects.
+
+    ``distinct`` also accepts ``{"field": name}`` and is normalized to the
+    bare field name, so handlers can pass args straight to the driver.
+    """
+    if operation not in _MONGO_ARG_TYPES:
+        raise ValueError(f"Unsupported operation: {operation}")
+    
+    expected_type, description = _MONGO_ARG_TYPES[operation]
+    if isinstance(args, expected_type):
+        return args
+    if operation == 'distinct' and isinstance(args, dict):
+        return args.get('field', '')
+    
+    raise ValueError(f"{operation} requires {description}")
+
+
+def _find(collection: "Collection", args: dict) -> list:
+    return list(collection.find(args))
+
+
+def _find_one(collection: "Collection", args: dict) -> list:
+    return [collection.find_one(args)]
+
+
+def _count_documents(collection: "Collection", args: dict) -> list:
+    return [{"count": collection.count_documents(args)}]
+
+
+def _aggregate(collection: "Collection", args: list) -> list:
+    return list(collection.aggregate(args))
+
+
+def _distinct(collection: "Collection", args: str) -> list:
+    return [{"values": collection.distinct(args)}]
+
+
+# Supported operations, keyed by the name used in the query string
+_MONGO_OPS: Dict[str, Callable[["Collection", Any], list]] = {
+    'find': _find,
+    'find_one': _find_one,
+    'count_documents': _count_documents,
+    'aggregate': _aggregate,
+    'distinct': _distinct,
+}
+
+
+def _connection_string() -> str:
+    """Build the MongoDB connection string from the configuration."""
+    if Config.DB_USER and Config.DB_PASSWORD:
+        return (
+            f"mongodb://{Config.DB_USER}:{Config.DB_PASSWORD}@"
+            f"{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}"
+        )
+    return f"mongodb://{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}"
+
+
+@cache
+def _mongo_client(connection_string: str) -> "MongoClient":
+    """Return the process-wide client for a connection string.
+
+    A MongoClient owns a socket pool and monitor threads, so one is shared by
+    every MongoDB instance instead of being rebuilt per instance.
+    """
+    try:
+        from pymongo import MongoClient
+    except ImportError as exc:
+        raise ImportError(
+            "pymongo is required for MongoDB connections. "
+            "Install it with: pip install pymongo"
+        ) from exc
+
+    client = MongoClient(connection_string, maxPoolSize=50)
+    atexit.register(client.close)
+    return client
 
 
 class MongoDB(BaseDatabase):
     """MongoDB NoSQL database implementation."""
 
+    __slots__ = ('client', 'database')
+
     def __init__(self):
         """Initialize MongoDB connection."""
-        # Build connection string
-        if Config.DB_USER and Config.DB_PASSWORD:
-            connection_string = (
-                f"mongodb://{Config.DB_USER}:{Config.DB_PASSWORD}@"
-                f"{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}"
-            )
-        else:
-            connection_string = f"mongodb://{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}"
-        
-        self.client = MongoClient(connection_string)
-        self.database: MongoDatabase = self.client[Config.DB_NAME]
+        self.client = _mongo_client(_connection_string())
+        self.database: "MongoDatabase" = self.client[Config.DB_NAME]
 
     def execute_query(self, query: str) -> Any:
         """Execute a MongoDB query and return results as JSON.
@@ -38,126 +163,98 @@ class MongoDB(BaseDatabase):
         - users.aggregate([{"$group": {"_id": "$city", "count": {"$sum": 1}}}])
         - users.count_documents({})
         """
+        # ObjectId, Decimal128 and other BSON types are stringified by the encoder
+        return to_json(self._run_query(query))
+
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute a MongoDB query and yield the documents it returns."""
+        yield from self._run_query(query)
+
+    def _run_query(self, query: str) -> list:
+        """Execute a MongoDB query and return the operation's result rows."""
         try:
-            # Parse the query string
-            # Format: collection_name.operation(json_args)
-            if '.' not in query:
-                raise ValueError("Query must be in format: collection_name.operation(args)")
-            
-            collection_name, operation_part = query.split('.', 1)
+            collection_name, operation, args = _parse_mongo_query(query)
             collection = self.database[collection_name]
             
-            # Extract operation and arguments
-            if '(' not in operation_part:
-                raise ValueError("Query must include operation with parentheses")
-            
-            operation = operation_part[:operation_part.index('(')]
-            args_str = operation_part[operation_part.index('(')+1:operation_part.rindex(')')]
-            
-            # Parse arguments (safely evaluate JSON)
-            if args_str.strip():
-                args = json.loads(args_str) if args_str.strip() else {}
-            else:
-                args = {}
-            
-            # Execute the operation
-            if operation == 'find':
-                if isinstance(args, dict):
-                    results = list(collection.find(args))
-                else:
-                    results = list(collection.find())
-            elif operation == 'find_one':
-                if isinstance(args, dict):
-                    results = [collection.find_one(args)]
-                else:
-                    results = [collection.find_one()]
-            elif operation == 'count_documents':
-                if isinstance(args, dict):
-                    count = collection.count_documents(args)
-                else:
-                    count = collection.count_documents({})
-                results = [{"count": count}]
-            elif operation == 'aggregate':
-                if isinstance(args, list):
-                    results = list(collection.aggregate(args))
-                else:
-                    raise ValueError("aggregate requires a list of pipeline stages")
-            elif operation == 'distinct':
-                # args should be field name
-                results = collection.distinct(args if isinstance(args, str) else args.get('field', ''))
-                results = [{"values": results}]
-            else:
-                raise ValueError(f"Unsupported operation: {operation}")
-            
-            # Convert ObjectId to string for JSON serialization
-            def convert_objectid(obj):
-                if hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes)):
-                    if isinstance(obj, dict):
-                        return {k: convert_objectid(v) for k, v in obj.items()}
-                    elif isinstance(obj, list):
-                        return [convert_objectid(item) for item in obj]
-                return str(obj) if hasattr(obj, '__class__') and obj.__class__.__name__ == 'ObjectId' else obj
-            
-            results = convert_objectid(results)
-            return json.dumps(results, default=str)
+            # Execute the operation (args were validated while parsing)
+            return _MONGO_OPS[operation](collection, args)
             
         except Exception as e:
             raise RuntimeError(f"Failed to execute MongoDB query: {str(e)}")
 
     def build_definition(self, storage_location: str) -> None:
-        """Build the database schema definition by sampling documents."""
+        """Build the database schema definition by sampling documents.
+
+        Field types are reported as BSON type names (string, int, objectId, ...).
+        """
         try:
             # Get all collection names
             collection_names = self.database.list_collection_names()
             
-            for collection_name in collection_names:
-                collection = self.database[collection_name]
-                
-                # Sample documents to infer schema
-                sample_docs = list(collection.find().limit(100))
-                
-                if not sample_docs:
-                    continue
-                
-                # Analyze fields across all sampled documents
-                all_fields = {}
-                for doc in sample_docs:
-                    for field, value in doc.items():
-                        if field not in all_fields:
-                            all_fields[field] = {
-                                'types': set(),
-                                'nullable': False,
-                                'is_id': field == '_id'
-                            }
-                        
-                        if value is None:
-                            all_fields[field]['nullable'] = True
-                        else:
-                            all_fields[field]['types'].add(type(value).__name__)
-                
-                # Build column definitions
-                columns = {}
-                for field, info in all_fields.items():
-                    data_type = ', '.join(sorted(info['types'])) if info['types'] else 'mixed'
-                    
-                    column_info = ColumnDefinition(
-                        name=field,
-                        data_type=data_type,
-                        is_nullable=info['nullable'],
-                        is_primary_key=info['is_id'],
-                        is_foreign_key=False,
-                        foreign_key_reference="",
-                        comments=f"Inferred from {len(sample_docs)} sample documents"
-                    )
-                    columns[field] = column_info
-                
-                table_info = TableDefinition(name=collection_name, columns=columns)
-                table_info.write_to_file(storage_location)
+            # Collections are sampled concurrently; MongoClient is thread-safe
+            with ThreadPoolExecutor(max_workers=SCHEMA_BUILD_WORKERS) as executor:
+                tables = list(executor.map(self._build_collection_definition, collection_names))
+            
+            write_definitions(
+                [table_info for table_info in tables if table_info is not None],
+                storage_location
+            )
                 
         except Exception as e:
             raise RuntimeError(f"Failed to build MongoDB schema definition: {str(e)}")
 
+    def _build_collection_definition(self, collection_name: str) -> Optional[TableDefinition]:
+        """Infer the definition of a single collection, or None if it is empty."""
+        collection = self.database[collection_name]
+        
+        # Sample documents and let the server collect (field, type) pairs
+        sample = next(collection.aggregate(_SCHEMA_SAMPLE_PIPELINE), None)
+        sample_size = sample["count"][0]["n"] if sample and sample["count"] else 0
+        
+        if not sample_size:
+            return None
+        
+        # Group the BSON type names reported for each field
+        all_fields = {}
+        for pair in sample["fields"]:
+            all_fields.setdefault(pair["_id"]["k"], set()).add(pair["_id"]["t"])
+        
+        # Build column definitions, _id first
+        columns = {}
+        for field in sorted(all_fields, key=lambda name: (name != '_id', name)):
+            types = all_fields[field]
+            is_nullable = 'null' in types
+            types.discard('null')
+            data_type = ', '.join(sorted(types)) if types else 'mixed'
+            
+            column_info = ColumnDefinition(
+                name=field,
+                data_type=data_type,
+                is_nullable=is_nullable,
+                is_primary_key=field == '_id',
+                is_foreign_key=False,
+                foreign_key_reference="",
+                comments=f"Inferred from {sample_size} sample documents"
+            )
+            columns[field] = column_info
+        
+        return TableDefinition(name=collection_name, columns=columns)
+
+    def healthy(self) -> bool:
+        """Report whether this instance still holds the shared client.
+
+        pymongo monitors the servers in the background and retries a read
+        once after a network error, which covers a server restart.
+        """
+        return self.client is not None
+
+    def ping(self) -> None:
+        """Send the server a ping command."""
+        self.client.admin.command("ping")
+
     def close(self) -> None:
-        """Close the database connection."""
-        if self.client:
-            self.client.close()
+        """Release this instance's handle on the shared client.
+
+        The client itself stays open for other instances and is closed at exit.
+        """
+        self.client = None
@@ -1,109 +1,197 @@
 """MySQL database implementation."""
 
-import json
-from typing import Any
-
-from mysql import connector
-from mysql.connector import MySQLConnection
+import atexit
+from collections import defaultdict
+from contextlib import closing
+from functools import cache, partial
+from typing import Any, Dict, Iterator, Optional
 
 from DataAnalyst.config import Config
 from DataAnalyst.database.BaseDatabase import BaseDatabase
-from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition
+from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition, write_definitions
+from DataAnalyst.database.pool import QueuePool
+from DataAnalyst.database.serialization import cursor_to_json, iter_cursor, to_json
 
 
-class MySQL(BaseDatabase):
-    """MySQL database implementation."""
+@cache
+def _connection_pool() -> QueuePool:
+    """Return the process-wide MySQL connection pool.
 
-    def __init__(self):
-        """Initialize MySQL connection."""
-        self.connection: MySQLConnection = connector.connect(
+    Every query checks a connection out for its own duration, so concurrent
+    tool calls never share one; idle connections are reused instead of
+    reconnecting. Connections run in autocommit mode, so a reused connection
+    never carries an open transaction (and its snapshot) into the next query,
+    and one that sat idle is pinged first so a restarted server's dead
+    connections are replaced rather than failing a query.
+    """
+    try:
+        from mysql import connector
+    except ImportError as exc:
+        raise ImportError(
+            "mysql-connector-python is required for MySQL connections. "
+            "Install it with: pip install mysql-connector-python"
+        ) from exc
+
+    pool = QueuePool(
+        partial(
+            connector.connect,
             host=Config.DB_HOST,
             port=Config.DB_PORT,
             user=Config.DB_USER,
             password=Config.DB_PASSWORD,
-            database=Config.DB_NAME
-        )
+            database=Config.DB_NAME,
+            autocommit=True
+        ),
+        max_size=Config.DB_POOL_MAX_SIZE,
+        min_size=Config.DB_POOL_MIN_SIZE,
+        check=lambda connection: connection.ping(reconnect=False)
+    )
+    atexit.register(pool.close)
+    return pool
+
+
+class MySQL(BaseDatabase):
+    """MySQL database implementation."""
+
+    __slots__ = ('pool',)
+
+    def __init__(self):
+        """Initialize MySQL access through the shared connection pool."""
+        self.pool = _connection_pool()
 
     def execute_query(self, query: str) -> Any:
         """Execute a SQL query and return results as JSON."""
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(query)
-            
-            # Check if this is a SELECT query
-            if cursor.description is None:
-                self.connection.commit()
-                return json.dumps({"affected_rows": cursor.rowcount})
-            
-            row_headers = [x[0] for x in cursor.description]
-            rows = cursor.fetchall()
-            json_data = []
-            
-            for result in rows:
-                json_data.append(dict(zip(row_headers, result)))
-
-            return json.dumps(json_data, default=str)
-        finally:
-            cursor.close()
+        with self.pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(query)
+                
+                # Check if this is a SELECT query
+                if cursor.description is None:
+                    return to_json({"affected_rows": cursor.rowcount})
+                
+                # Rows are already dicts keyed by column name
+                return cursor_to_json(cursor)
+            finally:
+                cursor.close()
+
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute a query and yield its result rows as they are fetched.
+
+        The cursor is unbuffered, so rows are read off the socket batch by
+        batch instead of being loaded into the client up front.
+        """
+        with self.pool.connection() as connection:
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            try:
+                cursor.execute(query)
+
+                if cursor.description is not None:
+                    yield from iter_cursor(cursor)
+            finally:
+                cursor.close()
 
     def build_definition(self, storage_location: str) -> None:
         """Build the database schema definition and save it to the specified path."""
-        cursor = self.connection.cursor()
-        
-        try:
-            cursor.execute("SHOW TABLES")
-            tables = cursor.fetchall()
-
-            for (table_name,) in tables:
-                cursor.execute(f"SHOW FULL COLUMNS FROM {table_name}")
-                columns_info = cursor.fetchall()
-
-                columns = {}
-                for column in columns_info:
-                    name = column[0]
-                    data_type = column[1]
-                    is_nullable = column[3] == 'YES'
-                    is_primary_key = column[4] == 'PRI'
-                    is_foreign_key = column[4] == 'MUL'
-                    foreign_key_reference = ""
-                    comments = column[8] or ""
-                    
-                    column_info = ColumnDefinition(
-                        name=name,
-                        data_type=data_type,
-                        is_nullable=is_nullable,
-                        is_primary_key=is_primary_key,
-                        is_foreign_key=is_foreign_key,
-                        foreign_key_reference=foreign_key_reference,
-                        comments=comments
+        with self.pool.connection() as connection:
+            # columns_cursor holds a server-side prepared statement, reused for
+            # every table's column query; closing() releases both cursors even
+            # if creating the second one fails
+            with closing(connection.cursor()) as cursor, \
+                    closing(connection.cursor(prepared=True)) as columns_cursor:
+                cursor.execute("SHOW TABLES")
+                tables = cursor.fetchall()
+
+                # Get foreign key information for the whole schema once
+                cursor.execute(
+                    "SELECT TABLE_NAME, COLUMN_NAME, CONSTRAINT_NAME, "
+                    "REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME "
+                    "FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE "
+                    "WHERE TABLE_SCHEMA = %s",
+                    (Config.DB_NAME,)
+                )
+                foreign_keys_by_table: dict[str, list[tuple[str, str]]] = defaultdict(list)
+                for fk in cursor.fetchall():
+                    if fk[2] != 'PRIMARY':
+                        foreign_keys_by_table[fk[0]].append((fk[1], f"{fk[3]}.{fk[4]}"))
+
+                definitions = []
+                for (table_name,) in tables:
+                    columns_cursor.execute(
+                        "SELECT COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_COMMENT "
+                        "FROM INFORMATION_SCHEMA.COLUMNS "
+                        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s "
+                        "ORDER BY ORDINAL_POSITION",
+                        (Config.DB_NAME, table_name)
                     )
-                    columns[name] = column_info
+                    columns_info = columns_cursor.fetchall()
+
+                    columns = {}
+                    for column in columns_info:
+                        name = column[0]
+                        data_type = column[1]
+                        is_nullable = column[2] == 'YES'
+                        is_primary_key = column[3] == 'PRI'
+                        is_foreign_key = column[3] == 'MUL'
+                        foreign_key_reference = ""
+                        comments = column[4] or ""
+                    
+                        column_info = ColumnDefinition(
+                            name=name,
+                            data_type=data_type,
+                            is_nullable=is_nullable,
+                            is_primary_key=is_primary_key,
+                            is_foreign_key=is_foreign_key,
+                            foreign_key_reference=foreign_key_reference,
+                            comments=comments
+                        )
+                        columns[name] = column_info
 
-                table_info = TableDefinition(name=table_name, columns=columns)
+                    table_info = TableDefinition(name=table_name, columns=columns)
                 
-                # Get foreign key information
+                    for col_name, reference in foreign_keys_by_table[table_name]:
+                        col = table_info.get_column_by_name(col_name)
+                        if col:
+                            col.is_foreign_key = True
+                            col.foreign_key_reference = reference
+
+                    definitions.append(table_info)
+
+                write_definitions(definitions, storage_location)
+
+    def schema_version(self) -> Optional[str]:
+        """Return order-independent checksums of the schema's columns and keys.
+
+        Summed CRC32s avoid GROUP_CONCAT, whose output is silently truncated
+        at group_concat_max_len.
+        """
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
                 cursor.execute(
-                    f"SELECT TABLE_NAME, COLUMN_NAME, CONSTRAINT_NAME, "
-                    f"REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME "
-                    f"FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE "
-                    f"WHERE TABLE_SCHEMA = '{Config.DB_NAME}'"
+                    "SELECT "
+                    "(SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS(':', "
+                    "    TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_COMMENT"
+                    "))), 0)) FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = %s), "
+                    "(SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS(':', "
+                    "    TABLE_NAME, COLUMN_NAME, CONSTRAINT_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME"
+                    "))), 0)) FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = %s)",
+                    (Config.DB_NAME, Config.DB_NAME)
                 )
-                fk_info = cursor.fetchall()
-                
-                for fk in fk_info:
-                    if fk[0] == table_name and fk[2] != 'PRIMARY':
-                        col_name = fk[1]
-                        if col_name in columns:
-                            col = table_info.get_column_by_name(col_name)
-                            if col:
-                                col.is_foreign_key = True
-                                col.foreign_key_reference = f"{fk[3]}.{fk[4]}"
-
-                table_info.write_to_file(storage_location)
-        finally:
-            cursor.close()
+                return ":".join(map(str, cursor.fetchone()))
+            finally:
+                cursor.close()
+
+    def healthy(self) -> bool:
+        """Report whether this instance still holds the shared pool.
+
+        Dead connections are weeded out by the pool's ping on checkout.
+        """
+        return self.pool is not None
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
\ No newline at end of file
+        """Release this instance's handle on the shared connection pool.
+
+        The pool itself stays open for other instances and is closed at exit.
+        """
+        self.pool = None
\ No newline at end of file
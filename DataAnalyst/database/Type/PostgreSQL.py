@@ -1,122 +1,269 @@
 """PostgreSQL database implementation."""
 
-import json
-from typing import Any
-
-import psycopg
-from psycopg import Connection
+import atexit
+import re
+import sys
+from collections import defaultdict
+from functools import cache
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
 
 from DataAnalyst.config import Config
 from DataAnalyst.database.BaseDatabase import BaseDatabase
-from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition
+from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition, write_definitions
+from DataAnalyst.database.serialization import FETCH_SIZE, cursor_to_json, iter_cursor, to_json
+
+if TYPE_CHECKING:
+    from psycopg import Connection
+    from psycopg_pool import ConnectionPool
+
+# Statements that return rows and can be declared as a server-side cursor
+_ROW_QUERY_RE = re.compile(r"\s*(?:SELECT|WITH|VALUES|TABLE)\b", re.IGNORECASE)
+
+# Whole public schema in one result set, tagged by kind:
+#   ('table', table, NULL, ...), ('column', table, column, type, is_nullable, ...),
+#   ('pk', table, column, ...), ('fk', table, column, NULL, NULL, ref_table, ref_column)
+_SCHEMA_QUERY = (
+    "WITH t AS ("
+    "  SELECT table_name FROM information_schema.tables "
+    "  WHERE table_schema = 'public' AND table_type = 'BASE TABLE'"
+    ") "
+    "SELECT kind, table_name, name, data_type, is_nullable, ref_table, ref_column FROM ("
+    "  SELECT 'table' AS kind, t.table_name::text AS table_name, NULL::text AS name, "
+    "    NULL::text AS data_type, NULL::text AS is_nullable, NULL::text AS ref_table, "
+    "    NULL::text AS ref_column, 0 AS position "
+    "  FROM t "
+    "  UNION ALL "
+    "  SELECT 'column', c.table_name::text, c.column_name::text, c.data_type::text, "
+    "    c.is_nullable::text, NULL, NULL, c.ordinal_position::int "
+    "  FROM information_schema.columns AS c "
+    "  JOIN t ON t.table_name = c.table_name "
+    "  WHERE c.table_schema = 'public' "
+    "  UNION ALL "
+    "  SELECT 'pk', cl.relname::text, a.attname::text, NULL, NULL, NULL, NULL, 0 "
+    "  FROM pg_index i "
+    "  JOIN pg_class cl ON cl.oid = i.indrelid "
+    "  JOIN pg_namespace n ON n.oid = cl.relnamespace "
+    "  JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+    "  WHERE n.nspname = 'public' AND i.indisprimary "
+    "  UNION ALL "
+    "  SELECT 'fk', tc.table_name::text, kcu.column_name::text, NULL, NULL, "
+    "    ccu.table_name::text, ccu.column_name::text, 0 "
+    "  FROM information_schema.table_constraints AS tc "
+    "  JOIN information_schema.key_column_usage AS kcu "
+    "    ON tc.constraint_name = kcu.constraint_name "
+    "    AND tc.table_schema = kcu.table_schema "
+    "  JOIN information_schema.constraint_column_usage AS ccu "
+    "    ON ccu.constraint_name = tc.constraint_name "
+    "    AND ccu.table_schema = tc.table_schema "
+    "  WHERE tc.constraint_type = 'FOREIGN KEY' AND tc.table_schema = 'public'"
+    ") AS schema_rows "
+    "ORDER BY table_name, position"
+)
+
+# Digest of the public schema's tables, columns and key constraints, read
+# straight from the catalogs; far cheaper than _SCHEMA_QUERY
+_SCHEMA_VERSION_QUERY = (
+    "SELECT md5("
+    "  coalesce(string_agg("
+    "    c.relname || ':' || a.attname || ':' || a.atttypid::text || ':' || a.attnotnull::text, "
+    "    ',' ORDER BY c.relname, a.attnum"
+    "  ), '') || '|' || coalesce(("
+    "    SELECT string_agg(co.oid::text, ',' ORDER BY co.oid) FROM pg_constraint AS co "
+    "    WHERE co.connamespace = 'public'::regnamespace AND co.contype IN ('p', 'f')"
+    "  ), '')"
+    ") "
+    "FROM pg_class AS c "
+    "JOIN pg_attribute AS a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped "
+    "WHERE c.relnamespace = 'public'::regnamespace AND c.relkind IN ('r', 'p')"
+)
+
+# Executions of the same statement on a connection before psycopg prepares
+# it (psycopg's default is 5)
+PREPARE_THRESHOLD = 2
+
+# Seconds the startup connection check waits for the server
+CONNECT_TIMEOUT = 10
+
+# Seconds an idle pooled connection is kept open before the pool closes it
+POOL_MAX_IDLE = 300.0
+
+
+@cache
+def _connection_pool() -> "ConnectionPool":
+    """Return the process-wide PostgreSQL connection pool.
+
+    psycopg connections must not be shared between threads, so every query
+    checks a connection out of the pool for its own duration instead of
+    going through one long-lived connection.
+    """
+    try:
+        import psycopg
+        from psycopg_pool import ConnectionPool
+    except ImportError as exc:
+        raise ImportError(
+            "psycopg-pool is required for PostgreSQL connections. "
+            "Install it with: pip install \"psycopg[pool]\""
+        ) from exc
+
+    connection_kwargs = {
+        "host": Config.DB_HOST,
+        "port": Config.DB_PORT,
+        "user": Config.DB_USER,
+        "password": Config.DB_PASSWORD,
+        "dbname": Config.DB_NAME,
+        # Statements run twice on a connection are prepared server-side,
+        # so repeats skip parsing and planning
+        "prepare_threshold": PREPARE_THRESHOLD,
+    }
+
+    # The pool connects in the background and would only report a bare
+    # PoolTimeout after its 30 s timeout; connect once up front so bad
+    # credentials or an unreachable host fail fast with the driver's error
+    psycopg.connect(**connection_kwargs, connect_timeout=CONNECT_TIMEOUT).close()
+
+    pool = ConnectionPool(
+        kwargs=connection_kwargs,
+        min_size=Config.DB_POOL_MIN_SIZE,
+        max_size=Config.DB_POOL_MAX_SIZE,
+        max_idle=POOL_MAX_IDLE,
+        check=ConnectionPool.check_connection,
+        open=True
+    )
+    atexit.register(pool.close)
+    return pool
 
 
 class PostgreSQL(BaseDatabase):
     """PostgreSQL database implementation."""
 
+    __slots__ = ('pool',)
+
     def __init__(self):
-        """Initialize PostgreSQL connection."""
-        self.connection: Connection = psycopg.connect(
-            host=Config.DB_HOST,
-            port=Config.DB_PORT,
-            user=Config.DB_USER,
-            password=Config.DB_PASSWORD,
-            dbname=Config.DB_NAME
-        )
+        """Initialize PostgreSQL access through the shared connection pool."""
+        self.pool: "ConnectionPool" = _connection_pool()
 
     def execute_query(self, query: str) -> Any:
         """Execute a SQL query and return results as JSON."""
-        cursor = self.connection.cursor()
-        try:
+        # The pool commits the transaction when the connection is handed back
+        with self.pool.connection() as connection:
+            if _ROW_QUERY_RE.match(query):
+                return self._stream_query(connection, query)
+
+            with connection.cursor() as cursor:
+                cursor.execute(query)
+                
+                # Check if this is a SELECT query
+                if cursor.description is None:
+                    return to_json({"affected_rows": cursor.rowcount})
+                
+                row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+                return cursor_to_json(cursor, row_headers)
+
+    @staticmethod
+    def _stream_query(connection: "Connection", query: str) -> str:
+        """Run a row-returning query through a server-side cursor.
+
+        Rows stay on the server and are fetched FETCH_SIZE at a time, so the
+        process never holds more than one batch of the result.
+        """
+        with connection.cursor(name="execute_query") as cursor:
+            cursor.itersize = FETCH_SIZE
             cursor.execute(query)
-            
-            # Check if this is a SELECT query
-            if cursor.description is None:
-                self.connection.commit()
-                return json.dumps({"affected_rows": cursor.rowcount})
-            
-            row_headers = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
-            json_data = []
-            
-            for result in rows:
-                json_data.append(dict(zip(row_headers, result)))
+            row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+            return cursor_to_json(cursor, row_headers)
+
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute a query and yield its result rows as they are fetched.
+
+        Row-returning statements run through a server-side cursor, like
+        execute_query, so rows are pulled from the server FETCH_SIZE at a time.
+        """
+        with self.pool.connection() as connection:
+            if _ROW_QUERY_RE.match(query):
+                cursor = connection.cursor(name="iter_query")
+                cursor.itersize = FETCH_SIZE
+            else:
+                cursor = connection.cursor()
+
+            with cursor:
+                cursor.execute(query)
 
-            return json.dumps(json_data, default=str)
-        finally:
-            cursor.close()
+                if cursor.description is not None:
+                    row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+                    yield from iter_cursor(cursor, row_headers)
 
     def build_definition(self, storage_location: str) -> None:
         """Build the database schema definition and save it to the specified path."""
-        cursor = self.connection.cursor()
-        
-        try:
-            # Get all tables in the public schema
-            cursor.execute(
-                "SELECT table_name FROM information_schema.tables "
-                "WHERE table_schema = 'public' AND table_type = 'BASE TABLE'"
-            )
-            tables = cursor.fetchall()
-
-            for (table_name,) in tables:
-                # Get column information
-                cursor.execute(
-                    "SELECT column_name, data_type, is_nullable, column_default "
-                    "FROM information_schema.columns "
-                    f"WHERE table_name = '{table_name}' "
-                    "ORDER BY ordinal_position"
-                )
-                columns_info = cursor.fetchall()
-
-                # Get primary keys
-                cursor.execute(
-                    "SELECT a.attname "
-                    "FROM pg_index i "
-                    "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
-                    f"WHERE i.indrelid = '{table_name}'::regclass AND i.indisprimary"
-                )
-                primary_keys = {row[0] for row in cursor.fetchall()}
-
-                # Get foreign keys
-                cursor.execute(
-                    "SELECT kcu.column_name, ccu.table_name, ccu.column_name "
-                    "FROM information_schema.table_constraints AS tc "
-                    "JOIN information_schema.key_column_usage AS kcu "
-                    "  ON tc.constraint_name = kcu.constraint_name "
-                    "  AND tc.table_schema = kcu.table_schema "
-                    "JOIN information_schema.constraint_column_usage AS ccu "
-                    "  ON ccu.constraint_name = tc.constraint_name "
-                    "  AND ccu.table_schema = tc.table_schema "
-                    f"WHERE tc.constraint_type = 'FOREIGN KEY' AND tc.table_name = '{table_name}'"
+        # One statement returns every table, column, primary key and foreign
+        # key as rows tagged by kind, so the refresh costs a single round trip
+        # and sees one consistent snapshot of the catalog. Nothing is written
+        # unless the whole result arrives.
+        with self.pool.connection() as connection, connection.cursor() as cursor:
+            cursor.execute(_SCHEMA_QUERY, prepare=True)
+            rows = cursor.fetchall()
+
+        tables = []
+        columns_by_table = defaultdict(list)
+        primary_keys_by_table = defaultdict(set)
+        foreign_keys_by_table = defaultdict(dict)
+        for kind, table_name, name, data_type, is_nullable, ref_table, ref_column in rows:
+            if kind == 'column':
+                columns_by_table[table_name].append((name, data_type, is_nullable))
+            elif kind == 'table':
+                tables.append(table_name)
+            elif kind == 'pk':
+                primary_keys_by_table[table_name].add(name)
+            else:
+                foreign_keys_by_table[table_name][name] = f"{ref_table}.{ref_column}"
+
+        definitions = []
+        for table_name in tables:
+            columns_info = columns_by_table[table_name]
+            primary_keys = primary_keys_by_table[table_name]
+            foreign_keys = foreign_keys_by_table[table_name]
+
+            columns = {}
+            for column in columns_info:
+                name = column[0]
+                data_type = column[1]
+                is_nullable = column[2] == 'YES'
+                is_primary_key = name in primary_keys
+                is_foreign_key = name in foreign_keys
+                foreign_key_reference = foreign_keys.get(name, "")
+                
+                column_info = ColumnDefinition(
+                    name=name,
+                    data_type=data_type,
+                    is_nullable=is_nullable,
+                    is_primary_key=is_primary_key,
+                    is_foreign_key=is_foreign_key,
+                    foreign_key_reference=foreign_key_reference,
+                    comments=""
                 )
-                foreign_keys = {row[0]: f"{row[1]}.{row[2]}" for row in cursor.fetchall()}
-
-                columns = {}
-                for column in columns_info:
-                    name = column[0]
-                    data_type = column[1]
-                    is_nullable = column[2] == 'YES'
-                    is_primary_key = name in primary_keys
-                    is_foreign_key = name in foreign_keys
-                    foreign_key_reference = foreign_keys.get(name, "")
-                    
-                    column_info = ColumnDefinition(
-                        name=name,
-                        data_type=data_type,
-                        is_nullable=is_nullable,
-                        is_primary_key=is_primary_key,
-                        is_foreign_key=is_foreign_key,
-                        foreign_key_reference=foreign_key_reference,
-                        comments=""
-                    )
-                    columns[name] = column_info
-
-                table_info = TableDefinition(name=table_name, columns=columns)
-                table_info.write_to_file(storage_location)
-        finally:
-            cursor.close()
+                columns[name] = column_info
+
+            table_info = TableDefinition(name=table_name, columns=columns)
+            definitions.append(table_info)
+
+        write_definitions(definitions, storage_location)
+
+    def schema_version(self) -> Optional[str]:
+        """Return a digest of the public schema's catalog entries."""
+        with self.pool.connection() as connection:
+            (version,) = connection.execute(_SCHEMA_VERSION_QUERY).fetchone()
+        return version
+
+    def healthy(self) -> bool:
+        """Report whether the shared pool is open.
+
+        The pool checks each connection before handing it out and replaces
+        broken ones, so no round trip is needed here.
+        """
+        return self.pool is not None and not self.pool.closed
 
     def close(self) -> None:
-        """Close the database connection."""
-        if self.connection and not self.connection.closed:
-            self.connection.close()
\ No newline at end of file
+        """Release this instance's handle on the shared connection pool.
+
+        The pool itself stays open for other instances and is closed at exit.
+        """
+        self.pool = None
\ No newline at end of file
@@ -1,22 +1,58 @@
 """SQLite database implementation."""
 
-import json
 import sqlite3
-from typing import Any
+import sys
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterator, Optional
 
 from DataAnalyst.config import Config
 from DataAnalyst.database.BaseDatabase import BaseDatabase
-from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition
+from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition, write_definitions
+from DataAnalyst.database.serialization import cursor_to_json, iter_cursor, to_json
+
+# Applied to every new connection: WAL lets readers run alongside a writer,
+# and the page cache (64 MiB) plus memory-mapped I/O (256 MiB) keep
+# analytical reads off the read() path
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;"
+    "PRAGMA synchronous=NORMAL;"
+    "PRAGMA mmap_size=268435456;"
+    "PRAGMA cache_size=-65536;"
+    "PRAGMA temp_store=MEMORY;"
+)
 
 
 class SQLite(BaseDatabase):
     """SQLite database implementation."""
 
+    __slots__ = ('db_path', '_local', '_connections', '_connections_lock')
+
     def __init__(self):
-        """Initialize SQLite connection."""
-        db_path = getattr(Config, 'DB_PATH', 'database.db')
-        self.connection = sqlite3.connect(db_path)
-        self.connection.row_factory = sqlite3.Row
+        """Initialize SQLite access and open the calling thread's connection."""
+        self.db_path = getattr(Config, 'DB_PATH', 'database.db')
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self.connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use.
+
+        Tool calls run concurrently on worker threads, and a SQLite connection
+        must not be shared between them; with WAL each thread's connection
+        reads alongside the others. Connections are still created with
+        check_same_thread=False so close() can release them from any thread.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.executescript(_CONNECTION_PRAGMAS)
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
 
     def execute_query(self, query: str) -> Any:
         """Execute a SQL query and return results as JSON."""
@@ -27,16 +63,25 @@ class SQLite(BaseDatabase):
             # Check if this is a SELECT query
             if cursor.description is None:
                 self.connection.commit()
-                return json.dumps({"affected_rows": cursor.rowcount})
-            
-            row_headers = [x[0] for x in cursor.description]
-            rows = cursor.fetchall()
-            json_data = []
+                return to_json({"affected_rows": cursor.rowcount})
             
-            for result in rows:
-                json_data.append(dict(zip(row_headers, result)))
+            row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+            return cursor_to_json(cursor, row_headers)
+        finally:
+            cursor.close()
+
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute a query and yield its result rows as they are fetched."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query)
 
-            return json.dumps(json_data, default=str)
+            if cursor.description is None:
+                self.connection.commit()
+                return
+
+            row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+            yield from iter_cursor(cursor, row_headers)
         finally:
             cursor.close()
 
@@ -45,49 +90,71 @@ class SQLite(BaseDatabase):
         cursor = self.connection.cursor()
         
         try:
-            # Get all tables
+            # Get column information for every table in one statement by
+            # joining sqlite_master with the table-valued pragma functions
+            cursor.execute(
+                'SELECT m.name, t.name, t.type, t."notnull", t.pk '
+                "FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS t "
+                "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%' "
+                "ORDER BY m.name, t.cid"
+            )
+            columns_by_table = defaultdict(list)
+            for row in cursor.fetchall():
+                columns_by_table[row[0]].append(row[1:])
+
+            # Get foreign key information for every table
             cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+                'SELECT m.name, f."from", f."table", f."to" '
+                "FROM sqlite_master AS m JOIN pragma_foreign_key_list(m.name) AS f "
+                "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'"
             )
-            tables = cursor.fetchall()
+            foreign_keys_by_table = defaultdict(dict)
+            for row in cursor.fetchall():
+                foreign_keys_by_table[row[0]][row[1]] = f"{row[2]}.{row[3]}"
 
-            for (table_name,) in tables:
-                # Get column information
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                columns_info = cursor.fetchall()
+            definitions = []
+            for table_name, columns_info in columns_by_table.items():
+                foreign_keys = foreign_keys_by_table[table_name]
 
                 columns = {}
                 for column in columns_info:
-                    cid, name, data_type, is_nullable, default_value, is_primary_key = column
+                    name, data_type, is_nullable, is_primary_key = column
                     
                     column_info = ColumnDefinition(
                         name=name,
                         data_type=data_type,
                         is_nullable=not is_nullable,  # 0 means NOT NULL, 1 means nullable
                         is_primary_key=bool(is_primary_key),
-                        is_foreign_key=False,
-                        foreign_key_reference="",
+                        is_foreign_key=name in foreign_keys,
+                        foreign_key_reference=foreign_keys.get(name, ""),
                         comments=""
                     )
                     columns[name] = column_info
 
-                # Get foreign key information
-                cursor.execute(f"PRAGMA foreign_key_list({table_name})")
-                fk_info = cursor.fetchall()
-                
-                for fk in fk_info:
-                    seq, table_ref, from_col, to_col, on_delete, on_update, match = fk
-                    if from_col in columns:
-                        col = columns[from_col]
-                        col.is_foreign_key = True
-                        col.foreign_key_reference = f"{table_ref}.{to_col}"
-
                 table_info = TableDefinition(name=table_name, columns=columns)
-                table_info.write_to_file(storage_location)
+                definitions.append(table_info)
+
+            write_definitions(definitions, storage_location)
         finally:
             cursor.close()
 
+    def schema_version(self) -> Optional[str]:
+        """Return SQLite's schema cookie, bumped by every schema change."""
+        (version,) = self.connection.execute("PRAGMA schema_version").fetchone()
+        return str(version)
+
+    def healthy(self) -> bool:
+        """Run a trivial query to check the connection is still usable."""
+        try:
+            self.connection.execute("SELECT 1").close()
+        except sqlite3.Error:
+            return False
+        return True
+
     def close(self) -> None:
-        """Close the database connection."""
-        if self.connection:
-            self.connection.close()
+        """Close every thread's database connection."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
@@ -1,11 +1,51 @@
 """SQL Server Analysis Services (SSAS) implementation with MDX support."""
 
-import json
-from typing import Any
+import atexit
+import sys
+from collections import defaultdict
+from functools import cache
+from typing import Any, Dict, Iterator
 
 from DataAnalyst.config import Config
 from DataAnalyst.database.BaseDatabase import BaseDatabase
-from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition
+from DataAnalyst.database.definitions import ColumnDefinition, TableDefinition, write_definitions
+from DataAnalyst.database.pool import QueuePool, check_select_one
+from DataAnalyst.database.serialization import cursor_to_json, iter_cursor, to_json
+
+
+@cache
+def _connection_pool() -> QueuePool:
+    """Return the process-wide SSAS connection pool.
+
+    pyodbc connections are opened on demand and returned to the pool after
+    each query, so SSAS instances reuse them instead of reconnecting. A
+    connection that sat idle runs SELECT 1 before it is reused.
+    """
+    try:
+        import pyodbc
+    except ImportError:
+        raise ImportError(
+            "pyodbc is required for SSAS connections. "
+            "Install it with: pip install pyodbc"
+        )
+
+    # Build connection string for SSAS
+    connection_string = (
+        f"Driver={{ODBC Driver 17 for SQL Server}};"
+        f"Server={Config.DB_HOST}:{getattr(Config, 'DB_PORT', 2383)};"
+        f"Database={Config.DB_NAME};"
+        f"UID={Config.DB_USER};"
+        f"PWD={Config.DB_PASSWORD};"
+    )
+
+    pool = QueuePool(
+        lambda: pyodbc.connect(connection_string),
+        max_size=Config.DB_POOL_MAX_SIZE,
+        min_size=Config.DB_POOL_MIN_SIZE,
+        check=check_select_one
+    )
+    atexit.register(pool.close)
+    return pool
 
 
 class SSAS(BaseDatabase):
@@ -14,29 +54,18 @@ class SSAS(BaseDatabase):
     Supports MDX (Multidimensional Expressions) queries for OLAP data analysis.
     """
 
+    __slots__ = ('pool',)
+
     def __init__(self):
-        """Initialize SSAS connection."""
+        """Initialize SSAS access through the shared connection pool."""
+        # The pool opens DB_POOL_MIN_SIZE connections up front; check one out
+        # as well so bad settings fail here, not mid-query
         try:
-            import pyodbc
+            self.pool = _connection_pool()
+            with self.pool.connection():
+                pass
         except ImportError:
-            raise ImportError(
-                "pyodbc is required for SSAS connections. "
-                "Install it with: pip install pyodbc"
-            )
-        
-        self.pyodbc = pyodbc
-        
-        # Build connection string for SSAS
-        connection_string = (
-            f"Driver={{ODBC Driver 17 for SQL Server}};"
-            f"Server={Config.DB_HOST}:{getattr(Config, 'DB_PORT', 2383)};"
-            f"Database={Config.DB_NAME};"
-            f"UID={Config.DB_USER};"
-            f"PWD={Config.DB_PASSWORD};"
-        )
-        
-        try:
-            self.connection = pyodbc.connect(connection_string)
+            raise
         except Exception as e:
             raise ConnectionError(
                 f"Failed to connect to SSAS at {Config.DB_HOST}: {str(e)}"
@@ -51,21 +80,32 @@ class SSAS(BaseDatabase):
         Returns:
             JSON string containing query results
         """
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(query)
-            
-            # Fetch results
-            row_headers = [x[0] for x in cursor.description] if cursor.description else []
-            rows = cursor.fetchall()
-            json_data = []
-            
-            for result in rows:
-                json_data.append(dict(zip(row_headers, result)))
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+                
+                # Fetch results
+                if cursor.description is None:
+                    return to_json([])
 
-            return json.dumps(json_data, default=str)
-        finally:
-            cursor.close()
+                row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+                return cursor_to_json(cursor, row_headers)
+            finally:
+                cursor.close()
+
+    def iter_query(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute an MDX query and yield its result rows as they are fetched."""
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query)
+
+                if cursor.description is not None:
+                    row_headers = tuple(sys.intern(desc[0]) for desc in cursor.description)
+                    yield from iter_cursor(cursor, row_headers)
+            finally:
+                cursor.close()
 
     def build_definition(self, storage_location: str) -> None:
         """Build the SSAS schema definition by analyzing cubes and dimensions.
@@ -76,102 +116,117 @@ class SSAS(BaseDatabase):
         Args:
             storage_location: Path to save schema definition files
         """
-        cursor = self.connection.cursor()
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
         
-        try:
-            # Query system schema rowsets for SSAS metadata
-            # This uses DMV (Dynamic Management Views) to get cube information
-            discovery_query = """
-            SELECT DISTINCT
-                CATALOG_NAME,
-                CUBE_NAME,
-                CUBE_TYPE,
-                LAST_PROCESSED
-            FROM $System.MDSCHEMA_CUBES
-            ORDER BY CATALOG_NAME, CUBE_NAME
-            """
+            try:
+                # Query system schema rowsets for SSAS metadata
+                # This uses DMV (Dynamic Management Views) to get cube information
+                discovery_query = """
+                SELECT DISTINCT
+                    CATALOG_NAME,
+                    CUBE_NAME,
+                    CUBE_TYPE,
+                    LAST_PROCESSED
+                FROM $System.MDSCHEMA_CUBES
+                ORDER BY CATALOG_NAME, CUBE_NAME
+                """
             
-            cursor.execute(discovery_query)
-            cubes = cursor.fetchall()
+                cursor.execute(discovery_query)
+                cubes = cursor.fetchall()
             
-            for cube_row in cubes:
-                catalog_name, cube_name, cube_type, last_processed = cube_row
-                
-                # Get dimensions for this cube
-                dimensions_query = f"""
+                # Fetch dimensions and measures for every cube in one query
+                # each and group them by cube. DMV SQL has no IN predicate, so
+                # the rowsets are read unfiltered; rows for cubes that are not
+                # in the discovery result are simply never looked up.
+                cursor.execute("""
                 SELECT DISTINCT
+                    CUBE_NAME,
                     DIMENSION_NAME,
                     DIMENSION_UNIQUE_NAME,
                     DIMENSION_TYPE
                 FROM $System.MDSCHEMA_DIMENSIONS
-                WHERE CUBE_NAME = '{cube_name}'
                 ORDER BY DIMENSION_NAME
-                """
-                
-                cursor.execute(dimensions_query)
-                dimensions = cursor.fetchall()
-                
-                # Get measures for this cube
-                measures_query = f"""
+                """)
+                dimensions_by_cube = defaultdict(list)
+                for row in cursor.fetchall():
+                    dimensions_by_cube[row[0]].append(row[1:])
+
+                cursor.execute("""
                 SELECT DISTINCT
+                    CUBE_NAME,
                     MEASURE_NAME,
                     MEASURE_UNIQUE_NAME,
                     DATA_TYPE
                 FROM $System.MDSCHEMA_MEASURES
-                WHERE CUBE_NAME = '{cube_name}'
                 ORDER BY MEASURE_NAME
-                """
+                """)
+                measures_by_cube = defaultdict(list)
+                for row in cursor.fetchall():
+                    measures_by_cube[row[0]].append(row[1:])
+
+                definitions = []
+                for cube_row in cubes:
+                    catalog_name, cube_name, cube_type, last_processed = cube_row
                 
-                cursor.execute(measures_query)
-                measures = cursor.fetchall()
+                    dimensions = dimensions_by_cube[cube_name]
+                    measures = measures_by_cube[cube_name]
                 
-                # Build schema definition for this cube
-                columns = {}
+                    # Build schema definition for this cube
+                    columns = {}
                 
-                # Add dimensions as columns
-                for dim_row in dimensions:
-                    dim_name = dim_row[0]
-                    dim_unique_name = dim_row[1]
-                    dim_type = dim_row[2] or "Standard"
+                    # Add dimensions as columns
+                    for dim_row in dimensions:
+                        dim_name = dim_row[0]
+                        dim_unique_name = dim_row[1]
+                        dim_type = dim_row[2] or "Standard"
                     
-                    column_info = ColumnDefinition(
-                        name=dim_name,
-                        data_type=f"Dimension ({dim_type})",
-                        is_nullable=True,
-                        is_primary_key=False,
-                        is_foreign_key=False,
-                        foreign_key_reference="",
-                        comments=f"Dimension: {dim_unique_name}"
-                    )
-                    columns[dim_name] = column_info
+                        column_info = ColumnDefinition(
+                            name=dim_name,
+                            data_type=f"Dimension ({dim_type})",
+                            is_nullable=True,
+                            is_primary_key=False,
+                            is_foreign_key=False,
+                            foreign_key_reference="",
+                            comments=f"Dimension: {dim_unique_name}"
+                        )
+                        columns[dim_name] = column_info
                 
-                # Add measures as columns
-                for measure_row in measures:
-                    measure_name = measure_row[0]
-                    measure_unique_name = measure_row[1]
-                    data_type = measure_row[2] or "Decimal"
+                    # Add measures as columns
+                    for measure_row in measures:
+                        measure_name = measure_row[0]
+                        measure_unique_name = measure_row[1]
+                        data_type = measure_row[2] or "Decimal"
                     
-                    column_info = ColumnDefinition(
-                        name=measure_name,
-                        data_type=f"Measure ({data_type})",
-                        is_nullable=True,
-                        is_primary_key=False,
-                        is_foreign_key=False,
-                        foreign_key_reference="",
-                        comments=f"Measure: {measure_unique_name}"
-                    )
-                    columns[measure_name] = column_info
+                        column_info = ColumnDefinition(
+                            name=measure_name,
+                            data_type=f"Measure ({data_type})",
+                            is_nullable=True,
+                            is_primary_key=False,
+                            is_foreign_key=False,
+                            foreign_key_reference="",
+                            comments=f"Measure: {measure_unique_name}"
+                        )
+                        columns[measure_name] = column_info
                 
-                # Create and save table definition for this cube
-                table_info = TableDefinition(name=cube_name, columns=columns)
-                table_info.write_to_file(storage_location)
+                    # Create and save table definition for this cube
+                    table_info = TableDefinition(name=cube_name, columns=columns)
+                    definitions.append(table_info)
+
+                write_definitions(definitions, storage_location)
         
-        except Exception as e:
-            raise RuntimeError(f"Failed to build SSAS schema definition: {str(e)}")
-        finally:
-            cursor.close()
+            except Exception as e:
+                raise RuntimeError(f"Failed to build SSAS schema definition: {str(e)}")
+            finally:
+                cursor.close()
+
+    def healthy(self) -> bool:
+        """Report whether this instance still holds the shared pool."""
+        return self.pool is not None
 
     def close(self) -> None:
-        """Close the SSAS connection."""
-        if self.connection:
-            self.connection.close()
+        """Release this instance's handle on the shared connection pool.
+
+        The pool itself stays open for other instances and is closed at exit.
+        """
+        self.pool = None
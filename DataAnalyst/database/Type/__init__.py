@@ -1,14 +1,38 @@
 """
 Database type implementations.
+
+Backends are imported on first access (PEP 562), so only the module for the
+configured database type - and its driver - is ever loaded.
 """
 
-from .MySQL import MySQL
-from .PostgreSQL import PostgreSQL
-from .MSSQL import MSSQL
-from .MongoDB import MongoDB
-from .SQLite import SQLite
-from .SSAS import SSAS
-from .Elasticsearch import Elasticsearch
-from .InfluxDB import InfluxDB
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .MySQL import MySQL
+    from .PostgreSQL import PostgreSQL
+    from .MSSQL import MSSQL
+    from .MongoDB import MongoDB
+    from .SQLite import SQLite
+    from .SSAS import SSAS
+    from .Elasticsearch import Elasticsearch
+    from .InfluxDB import InfluxDB
+
+__all__ = ["MongoDB", "MSSQL", "MySQL", "PostgreSQL", "SQLite", "SSAS", "Elasticsearch", "InfluxDB"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a backend class the first time it is requested."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Each backend lives in a submodule of the same name; rebinding the name
+    # here replaces the submodule attribute the import system just set
+    backend = getattr(import_module(f".{name}", __name__), name)
+    globals()[name] = backend
+    return backend
+
 
-__all__ = ["MongoDB", "MSSQL", "MySQL", "PostgreSQL", "SQLite", "SSAS", "Elasticsearch", "InfluxDB"]
\ No newline at end of file
+def __dir__() -> List[str]:
+    """List the lazily importable backends."""
+    return sorted(__all__)
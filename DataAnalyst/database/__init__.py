@@ -6,6 +6,6 @@ Provides database connection management and schema definition handling.
 
 from .BaseDatabase import BaseDatabase
 from .DbTypes import DbTypes
-from .definitions import ColumnDefinition, TableDefinition
+from .definitions import ColumnDefinition, TableDefinition, write_definitions
 
-__all__ = ["BaseDatabase", "DbTypes", "ColumnDefinition", "TableDefinition"]
+__all__ = ["BaseDatabase", "DbTypes", "ColumnDefinition", "TableDefinition", "write_definitions"]
@@ -1,52 +1,106 @@
 """Database schema definition classes."""
 
-import json
 import os
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
 
+import orjson
 
+# All table definitions in one JSON object keyed by table name, written next
+# to the per-table files so the schema loads with a single read
+SCHEMA_BUNDLE = "_all.json"
+
+# Backend schema version recorded by the last full build
+SCHEMA_VERSION_FILE = ".version"
+
+
+@dataclass(slots=True)
 class ColumnDefinition:
     """Represents a database column definition."""
 
-    def __init__(
-        self,
-        name: str,
-        data_type: str,
-        is_nullable: bool,
-        is_primary_key: bool,
-        is_foreign_key: bool,
-        foreign_key_reference: str,
-        comments: str
-    ):
-        self.name = name
-        self.data_type = data_type
-        self.is_nullable = is_nullable
-        self.is_primary_key = is_primary_key
-        self.is_foreign_key = is_foreign_key
-        self.foreign_key_reference = foreign_key_reference
-        self.comments = comments
+    name: str
+    data_type: str
+    is_nullable: bool
+    is_primary_key: bool
+    is_foreign_key: bool
+    foreign_key_reference: str
+    comments: str
 
 
+@dataclass(slots=True)
 class TableDefinition:
     """Represents a database table definition."""
 
-    def __init__(
-        self,
-        name: str,
-        columns: Dict[str, ColumnDefinition]
-    ):
-        self.name = name
-        self._columns = columns
+    name: str
+    columns: Dict[str, ColumnDefinition]
 
     def write_to_file(self, storage_location: str) -> None:
         """Save the table definition to a JSON file."""
-        file_path = os.path.join(storage_location, f"{self.name}.json")
-        with open(file_path, "w") as f:
-            json.dump({
-                "name": self.name,
-                "columns": {name: vars(col) for name, col in self._columns.items()}
-            }, f, indent=2)
+        write_definitions([self], storage_location, prune=False)
 
     def get_column_by_name(self, column_name: str) -> Optional[ColumnDefinition]:
         """Retrieve a column definition by its name."""
-        return self._columns.get(column_name, None)
\ No newline at end of file
+        return self.columns.get(column_name, None)
+
+
+def write_definitions(
+    tables: Iterable[TableDefinition],
+    storage_location: str,
+    prune: bool = True
+) -> None:
+    """Save table definitions to JSON files, one file per table.
+
+    Each definition is serialized up front by orjson into UTF-8 bytes. Files
+    whose contents are already identical are left untouched; changed files
+    are written to a temporary file and swapped in with os.replace(), so a
+    reader never sees a half-written definition. With ``prune`` the tables
+    are taken to be the complete schema: JSON files for tables that are no
+    longer present are removed, and the SCHEMA_BUNDLE file is rewritten.
+    """
+    written = {SCHEMA_BUNDLE}
+    bundle = []
+    for table in tables:
+        # orjson serializes (slotted) dataclasses natively, so no intermediate
+        # dicts are built for the table or its columns
+        payload = orjson.dumps(table, option=orjson.OPT_INDENT_2)
+        file_name = f"{table.name}.json"
+        written.add(file_name)
+        bundle.append(orjson.dumps(table.name) + b":" + payload)
+        _write_if_changed(os.path.join(storage_location, file_name), payload)
+
+    if prune:
+        # The bundle reuses the per-table payloads instead of encoding the
+        # definitions a second time
+        _write_if_changed(
+            os.path.join(storage_location, SCHEMA_BUNDLE),
+            b"{" + b",".join(bundle) + b"}"
+        )
+        with os.scandir(storage_location) as entries:
+            stale = [
+                entry.path for entry in entries
+                if entry.name.endswith(".json") and entry.name not in written
+            ]
+        for file_path in stale:
+            os.remove(file_path)
+
+
+def _write_if_changed(file_path: str, payload: bytes) -> None:
+    """Atomically replace the file with ``payload`` unless it already holds it."""
+    if _has_contents(file_path, payload):
+        return
+
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, file_path)
+
+
+def _has_contents(file_path: str, payload: bytes) -> bool:
+    """Return whether the file at ``file_path`` already holds exactly ``payload``."""
+    try:
+        if os.stat(file_path).st_size != len(payload):
+            return False
+        with open(file_path, "rb") as f:
+            return f.read() == payload
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,114 @@
+"""Generic connection pool for drivers that do not ship their own."""
+
+import queue
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+# Seconds an idle pooled connection is kept before it is closed and replaced
+DEFAULT_MAX_IDLE = 300.0
+
+# Seconds a pooled connection may sit idle before it is checked on checkout;
+# connections used more recently than this are handed out as they are
+DEFAULT_CHECK_IDLE = 30.0
+
+
+class QueuePool:
+    """A thread-safe pool of DB-API connections backed by a ``queue.Queue``.
+
+    Connections are created lazily by ``factory`` and handed back to the pool
+    when the ``connection()`` block exits. ``min_size`` connections are opened
+    up front so the first queries skip the connect round trip. At most ``max_size`` idle
+    connections are kept; connections idle for longer than ``max_idle``
+    seconds are closed on checkout instead of being reused, and a connection
+    whose block raised is closed rather than returned.
+
+    ``check``, if given, is called with a connection that has been idle for
+    more than ``check_idle`` seconds before it is handed out; a connection it
+    raises for (one the server dropped while it sat in the pool) is closed
+    and the next one tried, so a server restart does not fail a query.
+    """
+
+    __slots__ = ('_factory', '_idle', '_max_idle', '_check', '_check_idle')
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int,
+        max_idle: float = DEFAULT_MAX_IDLE,
+        min_size: int = 0,
+        check: Optional[Callable[[Any], Any]] = None,
+        check_idle: float = DEFAULT_CHECK_IDLE
+    ):
+        self._factory = factory
+        self._idle: "queue.LifoQueue[Tuple[Any, float]]" = queue.LifoQueue(maxsize=max_size)
+        self._max_idle = max_idle
+        self._check = check
+        self._check_idle = check_idle
+        for _ in range(min(min_size, max_size)):
+            self._release(factory())
+
+    def _acquire(self) -> Any:
+        """Return a fresh-enough idle connection, or open a new one."""
+        while True:
+            try:
+                connection, returned_at = self._idle.get_nowait()
+            except queue.Empty:
+                return self._factory()
+            idle_for = time.monotonic() - returned_at
+            if idle_for > self._max_idle:
+                _close_quietly(connection)
+            elif self._check is None or idle_for <= self._check_idle:
+                return connection
+            else:
+                try:
+                    self._check(connection)
+                except Exception:
+                    _close_quietly(connection)
+                else:
+                    return connection
+
+    def _release(self, connection: Any) -> None:
+        """Put a connection back in the pool, closing it if the pool is full."""
+        try:
+            self._idle.put_nowait((connection, time.monotonic()))
+        except queue.Full:
+            _close_quietly(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Check a connection out of the pool for the duration of the block."""
+        connection = self._acquire()
+        try:
+            yield connection
+        except BaseException:
+            _close_quietly(connection)
+            raise
+        self._release(connection)
+
+    def close(self) -> None:
+        """Close every idle connection held by the pool."""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _close_quietly(connection)
+
+
+def check_select_one(connection: Any) -> None:
+    """Run ``SELECT 1`` on a connection; a pool check for drivers without a ping."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _close_quietly(connection: Any) -> None:
+    """Close a connection, ignoring errors from an already broken one."""
+    try:
+        connection.close()
+    except Exception:
+        pass
@@ -0,0 +1,90 @@
+"""JSON serialization helpers for database query results."""
+
+import io
+from decimal import Decimal
+from itertools import islice, repeat
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence
+
+import orjson
+
+# Number of rows pulled from a cursor per fetchmany() call when streaming
+FETCH_SIZE = 10_000
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def json_default(value: Any) -> Any:
+    """Encode a value orjson has no native support for.
+
+    orjson handles datetime, date, UUID and the like itself and only calls
+    this for the rest. Decimal becomes its exact string form (a float would
+    lose precision), binary values become hex, and anything else (ObjectId,
+    timedelta, ...) falls back to ``str()``.
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return value.hex()
+    return str(value)
+
+
+def to_json(data: Any) -> str:
+    """Serialize query results to a JSON string, using json_default for unknown types."""
+    return orjson.dumps(data, default=json_default, option=_OPTIONS).decode()
+
+
+def iter_cursor(
+    cursor: Any,
+    row_headers: Optional[Sequence[str]] = None,
+    fetch_size: int = FETCH_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """Yield the remaining rows of a DB-API cursor, ``fetch_size`` at a time.
+
+    If ``row_headers`` is given, rows are sequences keyed by those names and
+    are turned into dicts; otherwise they must already be mappings.
+    """
+    while rows := cursor.fetchmany(fetch_size):
+        if row_headers is not None:
+            # Build the row dicts with map() so the per-row loop stays in C;
+            # this beats both a comprehension and encoding each value with
+            # precomputed '"name":' prefixes
+            rows = map(dict, map(zip, repeat(row_headers), rows))
+        yield from rows
+
+
+def encode_rows(
+    rows: Iterable[Mapping[str, Any]],
+    batch_size: int = FETCH_SIZE
+) -> Iterator[bytes]:
+    """Encode rows as the comma-separated contents of a JSON array.
+
+    Rows are encoded ``batch_size`` at a time with one orjson call per batch,
+    and each chunk (with a leading comma after the first) is yielded as soon
+    as it is ready, so callers can write the array without materializing it.
+    """
+    rows = iter(rows)
+    separator = b""
+    while batch := list(islice(rows, batch_size)):
+        # Encode the whole batch in one call and drop its enclosing brackets
+        yield separator + orjson.dumps(batch, default=json_default, option=_OPTIONS)[1:-1]
+        separator = b","
+
+
+def cursor_to_json(
+    cursor: Any,
+    row_headers: Optional[Sequence[str]] = None,
+    fetch_size: int = FETCH_SIZE
+) -> str:
+    """Stream the remaining rows of a DB-API cursor into a JSON array.
+
+    Rows are fetched ``fetch_size`` at a time and each batch is encoded
+    straight into a byte buffer, so only one batch of row objects is alive
+    at any point. If ``row_headers`` is given, rows are sequences keyed by
+    those names; otherwise they must already be mappings.
+    """
+    buffer = io.BytesIO()
+    buffer.write(b"[")
+    for chunk in encode_rows(iter_cursor(cursor, row_headers, fetch_size), fetch_size):
+        buffer.write(chunk)
+    buffer.write(b"]")
+    return buffer.getvalue().decode()
@@ -0,0 +1,152 @@
+"""Keyword index used to send only the relevant part of the schema to the LLM."""
+
+import re
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+# Word boundaries inside identifiers: camelCase humps, then any run of
+# non-alphanumerics (underscores, dots, spaces)
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Words shorter than this (id, of, by, ...) match almost every table
+_MIN_WORD_LENGTH = 3
+
+# A table-name hit counts for more than a column-name hit
+_TABLE_NAME_WEIGHT = 3
+
+# One part of a possibly qualified name: "quoted", `quoted`, [quoted] or bare
+_NAME_PART = r'(?:"[^"]+"|`[^`]+`|\[[^\]]+\]|[\w$]+)'
+_NAME_PART_RE = re.compile(_NAME_PART)
+
+# What referenced_tables scans a query for: string literals (so their
+# contents are skipped), parentheses, and keywords or names
+_TOKEN_RE = re.compile(rf"'(?:[^']|'')*'|[()]|{_NAME_PART}")
+
+# The possibly schema-qualified name after FROM / JOIN; a following "("
+# means it is a function call (generate_series(...), LATERAL (...))
+_TABLE_NAME_RE = re.compile(rf"\s*({_NAME_PART}(?:\s*\.\s*{_NAME_PART})*)(\s*\()?")
+
+# Keywords that open a query inside parentheses
+_SUBQUERY_KEYWORDS = frozenset({"SELECT", "WITH"})
+
+# Names defined by a WITH clause: "name AS (" or "name(cols) AS ("
+_CTE_NAME_RE = re.compile(r"([\w$]+)\s*(?:\([^)]*\))?\s+AS\s*\(", re.IGNORECASE)
+
+# Name tokens and column tokens of one table
+TableTokens = Tuple[FrozenSet[str], FrozenSet[str]]
+
+
+def words(text: str) -> Set[str]:
+    """Split text or an identifier into lower-case words, with singular forms.
+
+    ``orderItems`` and ``order_items`` both give {order, orders, item, items}
+    (plural forms are added for singular words and vice versa), so a prompt
+    about "items" matches a table called ``item``.
+    """
+    result = set()
+    for word in _WORD_RE.findall(_CAMEL_RE.sub(" ", text).lower()):
+        if len(word) < _MIN_WORD_LENGTH:
+            continue
+        result.add(word)
+        if word.endswith("ies"):
+            result.add(f"{word[:-3]}y")
+        elif word.endswith("s"):
+            result.add(word[:-1])
+        elif word.endswith("y"):
+            result.add(f"{word[:-1]}ies")
+        else:
+            result.add(f"{word}s")
+    return result
+
+
+def index_schema(schemas: Mapping[str, Any]) -> Dict[str, TableTokens]:
+    """Precompute the words of every table's name and column names."""
+    index = {}
+    for table_name, table in schemas.items():
+        column_words: Set[str] = set()
+        for column_name in table.get("columns", {}):
+            column_words |= words(column_name)
+        index[table_name] = (frozenset(words(table_name)), frozenset(column_words))
+    return index
+
+
+def relevant_tables(
+    index: Mapping[str, TableTokens],
+    schemas: Mapping[str, Any],
+    prompt: str,
+    top_k: int
+) -> Optional[List[str]]:
+    """Pick the tables a prompt most likely refers to.
+
+    Tables are scored by the prompt words found in their name and column
+    names; the ``top_k`` best are kept, plus the tables their foreign keys
+    point to so joins can still be written. Returns None when the whole
+    schema should be used instead: it already has at most ``top_k`` tables,
+    or no table matched the prompt at all.
+    """
+    if len(index) <= top_k:
+        return None
+
+    prompt_words = words(prompt)
+    scored = []
+    for table_name, (name_words, column_words) in index.items():
+        score = (
+            _TABLE_NAME_WEIGHT * len(prompt_words & name_words)
+            + len(prompt_words & column_words)
+        )
+        if score:
+            scored.append((score, table_name))
+    if not scored:
+        return None
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    selected = [table_name for _, table_name in scored[:top_k]]
+
+    # Follow foreign keys one hop out of the selection
+    chosen = set(selected)
+    for table_name in list(selected):
+        for column in schemas[table_name].get("columns", {}).values():
+            referenced = column.get("foreign_key_reference", "").rpartition(".")[0]
+            if referenced in schemas and referenced not in chosen:
+                chosen.add(referenced)
+                selected.append(referenced)
+    return selected
+
+
+def referenced_tables(query: str) -> Set[str]:
+    """Return the unquoted, unqualified table names a query reads from.
+
+    Names defined by the query's own WITH clause are left out, as is the
+    FROM of expressions such as ``EXTRACT(YEAR FROM ...)``, ``SUBSTRING(...
+    FROM 2)`` and ``IS DISTINCT FROM``: inside parentheses, FROM only counts
+    when the parentheses hold a subquery.
+    """
+    ctes = set(_CTE_NAME_RE.findall(query))
+    tokens = list(_TOKEN_RE.finditer(query))
+    # One entry per open parenthesis: whether it holds a subquery
+    subqueries: List[bool] = []
+    previous = ""
+    tables = set()
+    for position, token in enumerate(tokens):
+        text = token.group().upper()
+        if text == "(":
+            following = tokens[position + 1].group().upper() if position + 1 < len(tokens) else ""
+            subqueries.append(following in _SUBQUERY_KEYWORDS)
+            continue
+        if text == ")":
+            if subqueries:
+                subqueries.pop()
+            continue
+
+        if (
+            text in ("FROM", "JOIN")
+            and (not subqueries or subqueries[-1])
+            and previous != "DISTINCT"
+        ):
+            reference = _TABLE_NAME_RE.match(query, token.end())
+            if reference and not reference.group(2):
+                name = _NAME_PART_RE.findall(reference.group(1))[-1].strip("\"`[]")
+                if name not in ctes:
+                    tables.add(name)
+        previous = text
+    return tables
@@ -3,18 +3,30 @@
 A Model Context Protocol (MCP) server for natural language database querying.
 """
 
-import argparse
-import json
+import asyncio
+import contextlib
+import io
 import os
-from typing import Any, Dict
-
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+import orjson
 from mcp.server.fastmcp import FastMCP
-from openai import OpenAI
 
 from DataAnalyst.config import Config
 from DataAnalyst.database import BaseDatabase
 from DataAnalyst.database.DbTypes import DbTypes
-from DataAnalyst.database.Type import MySQL, PostgreSQL, MSSQL, MongoDB, SQLite, SSAS, Elasticsearch, InfluxDB
+from DataAnalyst.database.definitions import SCHEMA_BUNDLE, SCHEMA_VERSION_FILE
+from DataAnalyst.database.serialization import encode_rows, json_default
+from DataAnalyst.schema_index import TableTokens, index_schema, referenced_tables, relevant_tables
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Initialize MCP server
 mcp = FastMCP(
@@ -28,48 +40,138 @@ mcp = FastMCP(
     ]
 )
 
+# Number of threads used to read schema files back into the cache
+SCHEMA_LOAD_WORKERS = 8
+
+# Seconds between pings while the CLI waits for input
+CLI_KEEPALIVE_INTERVAL = 5.0
+
+# Prompt history of the CLI, used when prompt_toolkit is installed
+CLI_HISTORY_FILE = os.path.expanduser("~/.data_analyst_history")
+
+# Tool responses are pretty-printed; query results are encoded once and
+# embedded as-is through orjson.Fragment rather than re-parsed
+_loads = orjson.loads
+
+
+def _dumps(obj: Any) -> str:
+    """Encode a tool response as indented JSON.
+
+    Raw rows (as printed by the CLI) may hold values orjson does not know,
+    such as Decimal; they are encoded like the backends' results.
+    """
+    return orjson.dumps(obj, default=json_default, option=orjson.OPT_INDENT_2).decode()
+
+
+# The opening (with any info string: sql, sqlite, postgresql, ...) and
+# closing markdown code fences around an LLM reply; either may be missing,
+# e.g. in a truncated reply
+_FENCE_RE = re.compile(r"^\s*```[\w+-]*[ \t]*\n?|\s*```\s*$")
+
+# The end of a statement: a semicolon that closes its line
+_STATEMENT_END_RE = re.compile(r";[ \t]*\r?\n")
+
+# A leading SELECT keyword; match() only looks at the start of the query, so
+# long queries are not stripped or upper-cased in full just to check it
+_SELECT_RE = re.compile(r"\s*select\b", re.IGNORECASE)
+
+# Number of prompt -> SQL answers kept between schema rebuilds
+PROMPT_CACHE_SIZE = 1024
+
+# Tables whose schema is sent with a single prompt; larger schemas are pruned
+# to the best keyword matches (plus the tables they reference)
+SCHEMA_PROMPT_TOP_K = 10
+
+# Largest number of prompts answered by one batched LLM call; accuracy drops
+# off for bigger batches
+MAX_PROMPT_BATCH = 8
+
+# One "sqlN: <query>" answer in a batched reply; a query runs until the next
+# label or the end of the reply
+_BATCH_ANSWER_RE = re.compile(r"^sql(\d+):\s*(.*?)\s*(?=^sql\d+:|\Z)", re.MULTILINE | re.DOTALL | re.IGNORECASE)
+
+_BATCH_INSTRUCTIONS = """
+BATCH MODE:
+- The user message holds several numbered requests, one per line, formatted as "textN: <request>".
+- Answer every request with exactly one query, formatted as "sqlN: <query>" with the same number N.
+- Give the answers in order, one after another, without markdown formatting or any other text.
+"""
+
+# Backend class name for each configured DB_TYPE; the class (and its driver)
+# is only imported once it is selected, from the DataAnalyst.database.Type
+# submodule of the same name
+_BACKENDS: Dict[DbTypes, str] = {
+    DbTypes.MYSQL: "MySQL",
+    DbTypes.POSTGRESQL: "PostgreSQL",
+    DbTypes.MSSQL: "MSSQL",
+    DbTypes.MONGODB: "MongoDB",
+    DbTypes.SQLITE: "SQLite",
+    DbTypes.SSAS: "SSAS",
+    DbTypes.ELASTICSEARCH: "Elasticsearch",
+    DbTypes.INFLUXDB: "InfluxDB",
+}
+
 # Global state
 _database_instance: BaseDatabase | None = None
 _schema_cache: Dict[str, Any] = {}
+# Keyword index of _schema_cache, for picking the tables relevant to a prompt
+_schema_index: Dict[str, TableTokens] = {}
+# System prompt rendered from _schema_cache; cleared whenever the schema reloads
+_instructions_cache: str | None = None
+# Bumped on every schema reload; keys the prompt -> SQL cache
+_schema_generation = 0
+# Shared LLM client, so calls reuse its HTTP keep-alive connections
+_openai_client: "OpenAI | None" = None
+
+# Tools run their blocking work on worker threads. Every backend checks out a
+# connection per query (from a pool, or one per thread), so queries run
+# concurrently; the locks only guard creating the backend instance, running
+# one schema build at a time and swapping the schema cache.
+_connection_lock = threading.Lock()
+_build_lock = threading.Lock()
+_schema_lock = threading.Lock()
+_client_lock = threading.Lock()
 
 
 def get_db_connection() -> BaseDatabase:
     """Get or create a database connection based on configuration."""
+    with _connection_lock:
+        return _get_db_connection()
+
+
+def _get_db_connection() -> BaseDatabase:
+    """Unlocked implementation of get_db_connection."""
     global _database_instance
     
     if _database_instance is not None:
-        return _database_instance
+        if _database_instance.healthy():
+            return _database_instance
+
+        # The connection went bad (server restart, network drop); replace it
+        try:
+            _database_instance.close()
+        except Exception:
+            pass
+        _database_instance = None
 
     db_type = Config.get_db_type()
-    
-    if db_type == DbTypes.MYSQL.value:
-        _database_instance = MySQL()
-    elif db_type == DbTypes.POSTGRESQL.value:
-        _database_instance = PostgreSQL()
-    elif db_type == DbTypes.MSSQL.value:
-        _database_instance = MSSQL()
-    elif db_type == DbTypes.MONGODB.value:
-        _database_instance = MongoDB()
-    elif db_type == DbTypes.SQLITE.value:
-        _database_instance = SQLite()
-    elif db_type == DbTypes.SSAS.value:
-        _database_instance = SSAS()
-    elif db_type == DbTypes.ELASTICSEARCH.value:
-        _database_instance = Elasticsearch()
-    elif db_type == DbTypes.INFLUXDB.value:
-        _database_instance = InfluxDB()
-    else:
+    backend_name = _BACKENDS.get(db_type)
+    if backend_name is None:
         raise ValueError(f"Unsupported database type: {db_type}")
 
+    # Look the class up on its submodule: once that submodule is imported,
+    # the package attribute of the same name may be the module, not the class
+    backend_module = import_module(f"DataAnalyst.database.Type.{backend_name}")
+    _database_instance = getattr(backend_module, backend_name)()
     return _database_instance
 
 
 def build_instructions(schemas: Dict[str, Any]) -> str:
     """Build system instructions for the LLM based on database schema."""
     query_type = "SQL"
-    if Config.get_db_type() == DbTypes.SSAS.value:
+    if Config.get_db_type() == DbTypes.SSAS:
         query_type = "MDX"
-    elif Config.get_db_type() == DbTypes.INFLUXDB.value:
+    elif Config.get_db_type() == DbTypes.INFLUXDB:
         query_type = "InfluxQL"
 
     return f"""You are a {query_type} query generator for a {Config.DB_TYPE} database.
@@ -82,7 +184,7 @@ IMPORTANT RESTRICTIONS:
 - If the request cannot be satisfied with a SELECT statement, explain why in plain text.
 
 Available tables and columns:
-{json.dumps(schemas, indent=2)}
+{orjson.dumps(schemas).decode()}
 
 Optimization Rules (CRITICAL - Always apply these):
 - Select only required columns (NEVER use SELECT *)
@@ -108,38 +210,138 @@ Optimization Rules (CRITICAL - Always apply these):
 """
 
 
+def _get_instructions() -> str:
+    """Return the system instructions for the current schema, building them on first use."""
+    global _instructions_cache
+
+    instructions = _instructions_cache
+    if instructions is None:
+        # Render under the schema lock so a concurrent rebuild cannot clear
+        # the cache between reading the schema and storing the result
+        with _schema_lock:
+            if _instructions_cache is None:
+                _instructions_cache = build_instructions(_schema_cache)
+            instructions = _instructions_cache
+    return instructions
+
+
+def _prompt_schema(prompt: str) -> Tuple[str, List[str] | None]:
+    """Return system instructions for a prompt and the tables they describe.
+
+    Large schemas are cut down to the tables the prompt most likely needs;
+    the table list is None when the instructions hold the full schema.
+    """
+    with _schema_lock:
+        tables = relevant_tables(_schema_index, _schema_cache, prompt, SCHEMA_PROMPT_TOP_K)
+        if tables is not None:
+            return build_instructions({name: _schema_cache[name] for name in tables}), tables
+    return _get_instructions(), None
+
+
 def is_select_statement(query: str) -> bool:
     """Check if the query is a SELECT statement."""
-    cleaned = query.strip().upper()
-    return cleaned.startswith("SELECT")
+    return _SELECT_RE.match(query) is not None
+
+
+def _strip_fence(text: str) -> str:
+    """Remove a markdown code block wrapped around an LLM reply, if present."""
+    return _FENCE_RE.sub("", text).strip()
+
+
+def _get_client() -> "OpenAI":
+    """Return the shared LLM client, creating it on first use.
+
+    openai (and the httpx stack under it) is imported here rather than at
+    module level, so starting the server does not pay for it.
+    """
+    global _openai_client
+
+    client = _openai_client
+    if client is None:
+        with _client_lock:
+            if _openai_client is None:
+                from openai import OpenAI
+
+                _openai_client = OpenAI(
+                    api_key=Config.LLM_API_KEY,
+                    base_url=Config.LLM_API_URL,
+                    max_retries=2,
+                    timeout=30.0
+                )
+            client = _openai_client
+    return client
+
+
+def _read_statement(stream: Any) -> str:
+    """Assemble a streamed completion, stopping at the end of the first statement.
+
+    Once a semicolon outside a string literal closes a line the statement is
+    complete; the stream is closed there instead of waiting for the model to
+    emit the closing fence or any commentary after it.
+    """
+    parts: List[str] = []
+    with stream:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if not content:
+                continue
+            parts.append(content)
+            if "\n" in content:
+                text = "".join(parts)
+                for end in _STATEMENT_END_RE.finditer(text):
+                    # Ignore semicolons inside string literals ('' escapes
+                    # keep the quote count even)
+                    if text.count("'", 0, end.start()) % 2 == 0:
+                        return text[:end.start() + 1]
+    return "".join(parts)
 
 
 def generate_sql_query(prompt: str) -> str:
-    """Generate SQL query from natural language using LLM."""
-    client = OpenAI(api_key=Config.LLM_API_KEY, base_url=Config.LLM_API_URL)
-    
+    """Generate SQL query from natural language using LLM.
+
+    Answers are cached per prompt until the schema is rebuilt, so a repeated
+    prompt skips the LLM round trip.
+    """
+    return _generate_sql_query(prompt, _schema_generation)
+
+
+def _request_statement(instructions: str, prompt: str) -> str:
+    """Ask the LLM for a single statement answering the prompt."""
+    response = _get_client().chat.completions.create(
+        model=Config.LLM_MODEL,
+        messages=[
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.0,  # Deterministic, so cached answers match fresh ones
+        max_tokens=500,
+        stream=True
+    )
+    return _strip_fence(_read_statement(response))
+
+
+@lru_cache(maxsize=PROMPT_CACHE_SIZE)
+def _generate_sql_query(prompt: str, schema_generation: int) -> str:
+    """Uncached implementation of generate_sql_query.
+
+    ``schema_generation`` is not used by the body; it only keys the cache, so
+    an answer generated for an older schema is never returned.
+    """
     try:
-        response = client.chat.completions.create(
-            model=Config.LLM_MODEL,
-            messages=[
-                {"role": "system", "content": build_instructions(_schema_cache)},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.1,  # Low temperature for more consistent SQL generation
-            max_tokens=500
-        )
-        
-        sql_query = response.choices[0].message.content.strip()
-        
-        # Clean up markdown code blocks if present
-        if sql_query.startswith("```sql"):
-            sql_query = sql_query[6:]
-        if sql_query.startswith("```"):
-            sql_query = sql_query[3:]
-        if sql_query.endswith("```"):
-            sql_query = sql_query[:-3]
-        
-        sql_query = sql_query.strip()
+        instructions, tables = _prompt_schema(prompt)
+        sql_query = _request_statement(instructions, prompt)
+
+        # The pruned schema may have left out a table the query needs; the
+        # model then reaches for a real table it was not shown, so ask again
+        # with the full schema. Names that are not tables at all (aliases the
+        # parser could not tell apart, invented names) would not be helped
+        if tables is not None:
+            shown = {name.lower() for name in tables}
+            missing = {name.lower() for name in referenced_tables(sql_query)} - shown
+            if missing and not missing.isdisjoint(name.lower() for name in _schema_cache):
+                sql_query = _request_statement(_get_instructions(), prompt)
         
         # Validate that only SELECT statements are generated
         if not is_select_statement(sql_query):
@@ -151,7 +353,7 @@ def generate_sql_query(prompt: str) -> str:
 
 
 @mcp.tool()
-def query_database_with_prompt(prompt: str) -> str:
+async def query_database_with_prompt(prompt: str) -> str:
     """Generate and execute a database query based on a natural language prompt.
     
     Args:
@@ -160,24 +362,142 @@ def query_database_with_prompt(prompt: str) -> str:
     Returns:
         JSON string containing query results or error message
     """
+    return await asyncio.to_thread(_query_database_with_prompt, prompt)
+
+
+def _query_rows(query: str) -> orjson.Fragment:
+    """Run a query and encode its rows once, ready to embed in a response.
+
+    Rows are encoded as they come off the backend; the resulting bytes are
+    spliced into the response as-is instead of being decoded and re-encoded.
+    """
+    db = get_db_connection()
+    buffer = io.BytesIO()
+    buffer.write(b"[")
+    for chunk in encode_rows(db.iter_query(query)):
+        buffer.write(chunk)
+    buffer.write(b"]")
+    return orjson.Fragment(buffer.getvalue())
+
+
+def _query_database_with_prompt(prompt: str) -> str:
+    """Blocking implementation of query_database_with_prompt."""
     try:
         # Generate SQL query
         sql_query = generate_sql_query(prompt)
         
-        # Execute query
-        db = get_db_connection()
-        result = db.execute_query(sql_query)
+        return _dumps({
+            "success": True,
+            "query": sql_query,
+            "data": _query_rows(sql_query)
+        })
+    except Exception as e:
+        return _dumps({
+            "success": False,
+            "error": str(e)
+        })
+
+def generate_sql_queries(prompts: List[str]) -> List[str]:
+    """Generate one SQL query per prompt with a single batched LLM call.
+
+    The schema-bearing system prompt is sent once for the whole batch. The
+    returned list is aligned with ``prompts``; a prompt the model did not
+    answer with a SELECT statement gets an empty string.
+    """
+    client = _get_client()
+    
+    try:
+        response = client.chat.completions.create(
+            model=Config.LLM_MODEL,
+            messages=[
+                {"role": "system", "content": _get_instructions() + _BATCH_INSTRUCTIONS},
+                {"role": "user", "content": "\n".join(
+                    f"text{number}: {' '.join(prompt.split())}" for number, prompt in enumerate(prompts, 1)
+                )}
+            ],
+            temperature=0.1,  # Low temperature for more consistent SQL generation
+            max_tokens=500 * len(prompts)
+        )
+    except Exception as e:
+        raise RuntimeError(f"Failed to generate SQL queries: {str(e)}")
+
+    queries = [""] * len(prompts)
+    reply = _strip_fence(response.choices[0].message.content)
+    for match in _BATCH_ANSWER_RE.finditer(reply):
+        index = int(match.group(1)) - 1
+        sql_query = _strip_fence(match.group(2))
+        if 0 <= index < len(queries) and is_select_statement(sql_query):
+            queries[index] = sql_query
+    return queries
+
+
+@mcp.tool()
+async def query_database_with_prompts(prompts: List[str]) -> str:
+    """Generate and execute database queries for several natural language prompts.
+    
+    All prompts are answered by one LLM call, which is cheaper and faster
+    than calling query_database_with_prompt once per prompt.
+    
+    Args:
+        prompts: Up to 8 natural language descriptions of the desired queries
         
-        return json.dumps({
+    Returns:
+        JSON string containing one result (or error) per prompt, in order
+    """
+    if not prompts:
+        return _dumps({
+            "success": False,
+            "error": "At least one prompt is required."
+        })
+    if len(prompts) > MAX_PROMPT_BATCH:
+        return _dumps({
+            "success": False,
+            "error": f"At most {MAX_PROMPT_BATCH} prompts can be batched in one call."
+        })
+
+    try:
+        sql_queries = await asyncio.to_thread(generate_sql_queries, prompts)
+    except Exception as e:
+        return _dumps({
+            "success": False,
+            "error": str(e)
+        })
+
+    # The queries are independent, so run them side by side
+    results = await asyncio.gather(*(
+        asyncio.to_thread(_execute_prompt_query, prompt, sql_query)
+        for prompt, sql_query in zip(prompts, sql_queries)
+    ))
+
+    return _dumps({
+        "success": True,
+        "results": results
+    })
+
+
+def _execute_prompt_query(prompt: str, sql_query: str) -> Dict[str, Any]:
+    """Execute one query of a prompt batch and describe its outcome."""
+    if not sql_query:
+        return {
+            "prompt": prompt,
+            "success": False,
+            "error": "No SELECT statement was generated for this prompt."
+        }
+
+    try:
+        return {
+            "prompt": prompt,
             "success": True,
             "query": sql_query,
-            "data": json.loads(result)
-        }, indent=2)
+            "data": _query_rows(sql_query)
+        }
     except Exception as e:
-        return json.dumps({
+        return {
+            "prompt": prompt,
             "success": False,
+            "query": sql_query,
             "error": str(e)
-        }, indent=2)
+        }
 
 def execute_sql_query(query: str) -> str:
     """Execute a raw SQL query directly on the database.
@@ -191,23 +511,20 @@ def execute_sql_query(query: str) -> str:
     try:
         # Validate that only SELECT statements are executed
         if not is_select_statement(query):
-            return json.dumps({
+            return _dumps({
                 "success": False,
                 "error": "Only SELECT statements are allowed. This query does not start with SELECT."
-            }, indent=2)
+            })
         
-        db = get_db_connection()
-        result = db.execute_query(query)
-        
-        return json.dumps({
+        return _dumps({
             "success": True,
-            "data": json.loads(result)
-        }, indent=2)
+            "data": _query_rows(query)
+        })
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "success": False,
             "error": str(e)
-        }, indent=2)
+        })
 
 
 @mcp.tool()
@@ -218,18 +535,18 @@ def get_database_schema() -> str:
         JSON string containing all table and column definitions
     """
     if not _schema_cache:
-        return json.dumps({
+        return _dumps({
             "success": False,
             "error": "Schema not loaded. Please run build_db_definition first."
-        }, indent=2)
+        })
     
-    return json.dumps({
+    return _dumps({
         "success": True,
         "schema": _schema_cache
-    }, indent=2)
+    })
 
 @mcp.tool()
-def build_db_definition() -> str:
+async def build_db_definition() -> str:
     """Build or rebuild the database schema definition.
     
     This scans the connected database and creates JSON files describing
@@ -238,41 +555,156 @@ def build_db_definition() -> str:
     Returns:
         JSON string indicating success or failure
     """
-    try:
-        db = get_db_connection()
+    return await asyncio.to_thread(_build_db_definition)
 
-        # Ensure schema directory exists
-        schema_dir = Config.SCHEMA_DIR
-        if not os.path.exists(schema_dir):
-            os.makedirs(schema_dir)
 
-        # Remove existing schema files
-        for filename in os.listdir(schema_dir):
-            if filename.endswith(".json"):
-                os.remove(os.path.join(schema_dir, filename))
+def _build_db_definition() -> str:
+    """Blocking implementation of build_db_definition."""
+    global _schema_cache, _schema_index, _instructions_cache, _schema_generation
 
-        # Build new schema definitions
-        db.build_definition(schema_dir)
-        
-        # Reload schema cache
-        _schema_cache.clear()
-        for filename in os.listdir(schema_dir):
-            if filename.endswith(".json"):
-                file_path = os.path.join(schema_dir, filename)
-                with open(file_path, "r") as f:
-                    table_name = filename[:-5]  # Remove .json extension
-                    _schema_cache[table_name] = json.load(f)
-
-        return json.dumps({
+    try:
+        # Builds write the schema directory, so they run one at a time; the
+        # schema lock is only taken to swap in the result, so prompts keep
+        # using the old schema while the database is introspected
+        with _build_lock:
+            db = get_db_connection()
+
+            # Ensure schema directory exists
+            schema_dir = Config.SCHEMA_DIR
+            os.makedirs(schema_dir, exist_ok=True)
+
+            # Skip the introspection while the backend reports the same
+            # schema version as the last build. The version is read before
+            # building, so a change made during the build triggers a rebuild
+            # next time.
+            version = _schema_version(db)
+            version_path = os.path.join(schema_dir, SCHEMA_VERSION_FILE)
+            if (
+                version is None
+                or _read_version(version_path) != version
+                or not os.path.exists(os.path.join(schema_dir, SCHEMA_BUNDLE))
+            ):
+                # Drop the old stamp first: a build without a version, or one
+                # that fails, must not leave a stamp that a later build of
+                # the configuration it came from would still match
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(version_path)
+
+                # Build new schema definitions; unchanged files are kept as
+                # they are and files for dropped tables are removed
+                db.build_definition(schema_dir)
+                if version is not None:
+                    with open(version_path, "w", encoding="utf-8") as f:
+                        f.write(version)
+
+            # Reload schema cache with one read of the bundle file
+            loaded = _load_schema(schema_dir)
+            index = index_schema(loaded)
+
+            with _schema_lock:
+                _schema_cache = loaded
+                _schema_index = index
+                # Rendered again on the next prompt, not on every rebuild
+                _instructions_cache = None
+                _schema_generation += 1
+                _generate_sql_query.cache_clear()
+
+        return _dumps({
             "success": True,
-            "message": f"Successfully loaded schema for {len(_schema_cache)} tables",
-            "tables": list(_schema_cache.keys())
-        }, indent=2)
+            "message": f"Successfully loaded schema for {len(loaded)} tables",
+            "tables": list(loaded.keys())
+        })
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "success": False,
             "error": str(e)
-        }, indent=2)
+        })
+
+
+def _schema_version(db: BaseDatabase) -> str | None:
+    """Return the backend's schema version, qualified by the configured database.
+
+    The schema directory is shared by every configuration, so the stamp also
+    names the database it was taken from. A backend that fails to report its
+    version gets None, so the schema is rebuilt in full.
+    """
+    try:
+        version = db.schema_version()
+    except Exception:
+        return None
+    if version is None:
+        return None
+    return f"{Config.DB_TYPE}://{Config.DB_HOST}:{Config.DB_PORT}/{Config.DB_NAME}#{version}"
+
+
+def _read_version(version_path: str) -> str | None:
+    """Return the schema version recorded by the last build, if any."""
+    try:
+        with open(version_path, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _load_schema(schema_dir: str) -> Dict[str, Any]:
+    """Read every table definition in the schema directory.
+
+    The bundle file holds the whole schema; when a backend did not write one,
+    the per-table files are read instead, in parallel when there are enough
+    of them to be worth a thread pool.
+    """
+    try:
+        with open(os.path.join(schema_dir, SCHEMA_BUNDLE), "rb") as f:
+            return _loads(f.read())
+    except FileNotFoundError:
+        pass
+
+    with os.scandir(schema_dir) as it:
+        entries = [
+            entry for entry in it
+            if entry.name.endswith(".json") and entry.is_file()
+        ]
+    workers = min(SCHEMA_LOAD_WORKERS, len(entries))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(executor.map(_load_schema_file, entries))
+    return dict(map(_load_schema_file, entries))
+
+
+def _load_schema_file(entry: os.DirEntry) -> Tuple[str, Any]:
+    """Read one schema file and return its table name and parsed contents."""
+    table_name = entry.name[:-5]  # Remove .json extension
+    with open(entry.path, "rb") as f:
+        return table_name, _loads(f.read())
+
+
+def _keep_connection_warm(idle: threading.Event, stop: threading.Event) -> None:
+    """Ping the database periodically while the CLI waits for input.
+
+    The ping keeps a connection in use, and a pool replaces one the server
+    dropped while the user was typing, so the next query does not pay for
+    the reconnect.
+    """
+    while not stop.wait(CLI_KEEPALIVE_INTERVAL):
+        if idle.is_set():
+            try:
+                get_db_connection().ping()
+            except Exception:
+                pass
+
+
+def _prompt_reader():
+    """Return a function that reads one line of user input.
+
+    prompt_toolkit (optional) adds line editing and a persistent history;
+    without it the built-in input() is used.
+    """
+    try:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+    except ImportError:
+        return input
+    return PromptSession(history=FileHistory(CLI_HISTORY_FILE)).prompt
 
 
 def run_cli_mode():
@@ -282,10 +714,19 @@ def run_cli_mode():
     print("=" * 60)
     print("Enter your prompt (or 'exit' to quit)")
     print("=" * 60)
+
+    read_prompt = _prompt_reader()
+    idle = threading.Event()
+    stop = threading.Event()
+    threading.Thread(target=_keep_connection_warm, args=(idle, stop), daemon=True).start()
     
     while True:
         try:
-            prompt = input("Your Prompt> ").strip()
+            idle.set()
+            try:
+                prompt = read_prompt("Your Prompt> ").strip()
+            finally:
+                idle.clear()
             
             if not prompt:
                 continue
@@ -295,19 +736,19 @@ def run_cli_mode():
                 break
             
             # Execute the query
-            query = generate_sql_query(prompt)
+            try:
+                query = generate_sql_query(prompt)
+            except RuntimeError as e:
+                print(f"\n✗ Error: {e}")
+                continue
             print(f"\nGenerated SQL Query:\n{query}\n")
-            result = execute_sql_query(query)
-            result_data = json.loads(result)
+            result_data = _loads(execute_sql_query(query))
             
             if result_data["success"]:
                 data = result_data["data"]
-                if isinstance(data, list) and len(data) > 0:
+                if data:
                     print(f"\n✓ Query returned {len(data)} row(s)")
-                    print(json.dumps(data, indent=2))
-                elif isinstance(data, dict):
-                    print(f"\n✓ Query executed")
-                    print(json.dumps(data, indent=2))
+                    print(_dumps(data))
                 else:
                     print(f"\n✓ Query executed successfully")
             else:
@@ -320,17 +761,52 @@ def run_cli_mode():
             print("\nGoodbye!")
             break
 
+    stop.set()
+
+
+def _cli_mode_requested(argv: List[str]) -> bool:
+    """Parse the command line and return whether --cli was given.
+
+    The two invocations seen in practice (no arguments, or just --cli) are
+    answered directly; argparse is only imported for anything else, such as
+    --help or an unknown flag.
+    """
+    if not argv:
+        return False
+    if argv == ["--cli"]:
+        return True
+
+    import argparse
 
-def main():
-    """Main entry point for the MCP server."""
-    # Parse command line arguments
     parser = argparse.ArgumentParser(description="MCP Data Analyst Server")
     parser.add_argument(
         "--cli",
         action="store_true",
         help="Run in CLI mode for interactive SQL queries instead of MCP server mode"
     )
-    args = parser.parse_args()
+    return parser.parse_args(argv).cli
+
+
+def _install_fast_event_loop() -> None:
+    """Run the MCP server on uvloop (winloop on Windows) when it is installed.
+
+    FastMCP starts its own event loop, so the faster loop is selected through
+    the event loop policy; without either package asyncio's default is kept.
+    """
+    try:
+        if sys.platform == "win32":
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(fast_loop.EventLoopPolicy())
+
+
+def main():
+    """Main entry point for the MCP server."""
+    # Parse command line arguments
+    cli_mode = _cli_mode_requested(sys.argv[1:])
     
     try:
         # Validate configuration
@@ -338,8 +814,8 @@ def main():
         
         # Build initial schema
         print("Building database schema...")
-        result = build_db_definition()
-        result_data = json.loads(result)
+        result = _build_db_definition()
+        result_data = _loads(result)
         
         if result_data["success"]:
             print(f"✓ {result_data['message']}")
@@ -349,13 +825,14 @@ def main():
             return
         
         # Run in CLI mode or MCP server mode
-        if args.cli:
+        if cli_mode:
             run_cli_mode()
         else:
             # Run the MCP server
             print(f"\nStarting MCP Data Analyst server...")
             print(f"Database: {Config.DB_TYPE} ({Config.DB_NAME})")
             print(f"LLM: {Config.LLM_MODEL}")
+            _install_fast_event_loop()
             mcp.run(transport="stdio")
         
     except KeyboardInterrupt:
@@ -363,9 +840,11 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
     finally:
-        # Clean up database connection
+        # Clean up database connection and LLM client
         if _database_instance:
             _database_instance.close()
+        if _openai_client:
+            _openai_client.close()
 
 
 if __name__ == "__main__":
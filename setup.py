@@ -130,25 +130,25 @@ def test_connection():
         Config.validate()
         
         db_type = Config.get_db_type()
-        if db_type == DbTypes.MYSQL.value:
+        if db_type == DbTypes.MYSQL:
             db = MySQL()
             db.execute_query("SELECT 1")
-        elif db_type == DbTypes.POSTGRESQL.value:
+        elif db_type == DbTypes.POSTGRESQL:
             db = PostgreSQL()
             db.execute_query("SELECT 1")
-        elif db_type == DbTypes.MSSQL.value:
+        elif db_type == DbTypes.MSSQL:
             db = MSSQL()
             db.execute_query("SELECT 1")
-        elif db_type == DbTypes.SQLITE.value:
+        elif db_type == DbTypes.SQLITE:
             db = SQLite()
             db.execute_query("SELECT 1")
-        elif db_type == DbTypes.INFLUXDB.value:
+        elif db_type == DbTypes.INFLUXDB:
             db = InfluxDB()
             db.execute_query("SHOW MEASUREMENTS")
         else:
-            db = MongoDB() if db_type == DbTypes.MONGODB.value else (
-                SSAS() if db_type == DbTypes.SSAS.value else (
-                    Elasticsearch() if db_type == DbTypes.ELASTICSEARCH.value else None
+            db = MongoDB() if db_type == DbTypes.MONGODB else (
+                SSAS() if db_type == DbTypes.SSAS else (
+                    Elasticsearch() if db_type == DbTypes.ELASTICSEARCH else None
                 )
             )
 
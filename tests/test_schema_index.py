@@ -0,0 +1,41 @@
+"""Tests for DataAnalyst.schema_index."""
+
+from DataAnalyst.schema_index import referenced_tables
+
+
+def test_plain_and_qualified_tables():
+    query = 'SELECT * FROM public."Orders" o JOIN customers c ON c.id = o.customer_id'
+    assert referenced_tables(query) == {"Orders", "customers"}
+
+
+def test_extract_from_is_not_a_table():
+    query = "SELECT EXTRACT(YEAR FROM created_at) AS year FROM orders"
+    assert referenced_tables(query) == {"orders"}
+
+
+def test_substring_from_is_not_a_table():
+    query = "SELECT SUBSTRING(name FROM 2) FROM customers"
+    assert referenced_tables(query) == {"customers"}
+
+
+def test_is_distinct_from_is_not_a_table():
+    query = "SELECT * FROM orders WHERE status IS NOT DISTINCT FROM previous_status"
+    assert referenced_tables(query) == {"orders"}
+
+
+def test_table_functions_are_not_tables():
+    query = "SELECT day FROM generate_series(1, 7) AS day"
+    assert referenced_tables(query) == set()
+
+
+def test_subqueries_and_ctes():
+    query = (
+        "WITH recent AS (SELECT * FROM orders) "
+        "SELECT * FROM recent WHERE customer_id IN (SELECT id FROM customers)"
+    )
+    assert referenced_tables(query) == {"orders", "customers"}
+
+
+def test_string_literals_are_skipped():
+    query = "SELECT 'moved from archive' AS note FROM orders"
+    assert referenced_tables(query) == {"orders"}